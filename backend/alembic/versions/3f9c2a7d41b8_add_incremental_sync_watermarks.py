@@ -0,0 +1,26 @@
+"""Add incremental sync watermarks to user permissions
+
+Revision ID: 3f9c2a7d41b8
+Revises: e5dd58bb77df
+Create Date: 2026-10-17 09:12:31.418202
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d41b8'
+down_revision = 'e5dd58bb77df'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_permissions', sa.Column('last_source_edited_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('user_permissions', sa.Column('last_full_sync_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_permissions', 'last_full_sync_at')
+    op.drop_column('user_permissions', 'last_source_edited_at')
@@ -0,0 +1,24 @@
+"""Add mirror hash to page mappings
+
+Revision ID: 4d7a1e9c3f60
+Revises: b61f8c3e2a95
+Create Date: 2026-10-17 20:12:05.417893
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7a1e9c3f60'
+down_revision = 'b61f8c3e2a95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_mappings', sa.Column('mirror_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('page_mappings', 'mirror_hash')
@@ -0,0 +1,35 @@
+"""Add next_sync_at to database configs for due-time scheduling
+
+Revision ID: 5b8e3f1a9c07
+Revises: c47e19b2d8a6
+Create Date: 2026-10-17 14:02:41.318520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e3f1a9c07'
+down_revision = 'c47e19b2d8a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'database_configs',
+        sa.Column('next_sync_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True)
+    )
+    # Configs that synced before are due one interval after their last sync
+    op.execute('''
+        UPDATE database_configs
+        SET next_sync_at = last_sync_at + make_interval(mins => COALESCE(sync_interval_minutes, 15))
+        WHERE last_sync_at IS NOT NULL
+    ''')
+    op.create_index('ix_database_configs_due', 'database_configs', ['sync_enabled', 'next_sync_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_database_configs_due', table_name='database_configs')
+    op.drop_column('database_configs', 'next_sync_at')
@@ -0,0 +1,24 @@
+"""Add per-phase timings to sync logs
+
+Revision ID: 7c3e9d5a2b14
+Revises: d2f6b0a8e41c
+Create Date: 2026-10-17 18:21:37.215480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9d5a2b14'
+down_revision = 'd2f6b0a8e41c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('sync_logs', sa.Column('timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sync_logs', 'timings')
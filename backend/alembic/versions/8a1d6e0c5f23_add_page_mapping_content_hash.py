@@ -0,0 +1,24 @@
+"""Add content hash to page mappings
+
+Revision ID: 8a1d6e0c5f23
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-17 10:03:47.205116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a1d6e0c5f23'
+down_revision = '3f9c2a7d41b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_mappings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('page_mappings', 'content_hash')
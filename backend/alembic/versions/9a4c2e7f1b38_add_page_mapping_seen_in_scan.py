@@ -0,0 +1,24 @@
+"""Add seen_in_scan to page mappings
+
+Revision ID: 9a4c2e7f1b38
+Revises: e83b5f2d0a17
+Create Date: 2026-10-17 21:34:52.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c2e7f1b38'
+down_revision = 'e83b5f2d0a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_mappings', sa.Column('seen_in_scan', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('page_mappings', 'seen_in_scan')
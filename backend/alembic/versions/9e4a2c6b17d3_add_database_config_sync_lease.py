@@ -0,0 +1,31 @@
+"""Add a sync lease to database configs to prevent overlapping runs
+
+Revision ID: 9e4a2c6b17d3
+Revises: 5b8e3f1a9c07
+Create Date: 2026-10-17 15:37:12.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4a2c6b17d3'
+down_revision = '5b8e3f1a9c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('database_configs', sa.Column('sync_lease_owner', sa.String(length=255), nullable=True))
+    op.add_column('database_configs', sa.Column('sync_lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        'database_configs',
+        sa.Column('sync_rerun_requested', sa.Boolean(), server_default=sa.text('false'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('database_configs', 'sync_rerun_requested')
+    op.drop_column('database_configs', 'sync_lease_expires_at')
+    op.drop_column('database_configs', 'sync_lease_owner')
@@ -0,0 +1,42 @@
+"""Add sync profiles and the profile-next-sync flag
+
+Revision ID: b61f8c3e2a95
+Revises: 7c3e9d5a2b14
+Create Date: 2026-10-17 19:04:12.638201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b61f8c3e2a95'
+down_revision = '7c3e9d5a2b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('database_configs', sa.Column('profile_next_sync', sa.Boolean(), server_default='false', nullable=False))
+    op.create_table('sync_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sync_log_id', sa.Integer(), nullable=False),
+    sa.Column('config_id', sa.Integer(), nullable=False),
+    sa.Column('cpu_profile', sa.LargeBinary(), nullable=False),
+    sa.Column('loop_lag', sa.JSON(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['config_id'], ['database_configs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['sync_log_id'], ['sync_logs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sync_log_id')
+    )
+    op.create_index(op.f('ix_sync_profiles_id'), 'sync_profiles', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_profiles_config_id'), 'sync_profiles', ['config_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sync_profiles_config_id'), table_name='sync_profiles')
+    op.drop_index(op.f('ix_sync_profiles_id'), table_name='sync_profiles')
+    op.drop_table('sync_profiles')
+    op.drop_column('database_configs', 'profile_next_sync')
@@ -0,0 +1,59 @@
+"""Link page mappings to the user permission that owns the mirror
+
+Revision ID: c47e19b2d8a6
+Revises: 8a1d6e0c5f23
+Create Date: 2026-10-17 11:26:05.771934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e19b2d8a6'
+down_revision = '8a1d6e0c5f23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_mappings', sa.Column('user_permission_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'page_mappings_user_permission_id_fkey', 'page_mappings', 'user_permissions',
+        ['user_permission_id'], ['id'], ondelete='CASCADE'
+    )
+
+    # Backfill: configs with a single user own all their mappings, otherwise
+    # fall back to the target-id prefix match the engine used before
+    op.execute('''
+        UPDATE page_mappings pm SET user_permission_id = up.id
+        FROM user_permissions up
+        WHERE up.config_id = pm.config_id
+          AND (
+            (SELECT COUNT(*) FROM user_permissions o WHERE o.config_id = pm.config_id) = 1
+            OR pm.target_page_id LIKE up.target_database_id || '%'
+          )
+    ''')
+    # Mappings that can't be attributed to a user were never matched by the engine
+    op.execute('DELETE FROM page_mappings WHERE user_permission_id IS NULL')
+
+    op.alter_column('page_mappings', 'user_permission_id', nullable=False)
+    op.drop_constraint('unique_config_source_page', 'page_mappings', type_='unique')
+    op.create_index(
+        'ix_page_mappings_user_permission_source', 'page_mappings',
+        ['user_permission_id', 'source_page_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_page_mappings_user_permission_source', table_name='page_mappings')
+    # Only one mapping per source page and config can survive the old constraint
+    op.execute('''
+        DELETE FROM page_mappings pm USING page_mappings other
+        WHERE pm.config_id = other.config_id
+          AND pm.source_page_id = other.source_page_id
+          AND pm.id > other.id
+    ''')
+    op.create_unique_constraint('unique_config_source_page', 'page_mappings', ['config_id', 'source_page_id'])
+    op.drop_constraint('page_mappings_user_permission_id_fkey', 'page_mappings', type_='foreignkey')
+    op.drop_column('page_mappings', 'user_permission_id')
@@ -0,0 +1,24 @@
+"""Add resumable sync checkpoints to user permissions
+
+Revision ID: d2f6b0a8e41c
+Revises: 9e4a2c6b17d3
+Create Date: 2026-10-17 17:08:53.462091
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b0a8e41c'
+down_revision = '9e4a2c6b17d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user_permissions', sa.Column('sync_checkpoint', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user_permissions', 'sync_checkpoint')
@@ -0,0 +1,29 @@
+"""Add scheduler credits
+
+Revision ID: e83b5f2d0a17
+Revises: 4d7a1e9c3f60
+Create Date: 2026-10-17 20:48:31.902614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e83b5f2d0a17'
+down_revision = '4d7a1e9c3f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduler_credits',
+    sa.Column('tenant_key', sa.String(length=255), nullable=False),
+    sa.Column('deficit', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('tenant_key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduler_credits')
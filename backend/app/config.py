@@ -13,10 +13,57 @@ class Settings(BaseSettings):
     notion_client_secret: str = ""
     notion_redirect_uri: str
 
+    # Notion API rate limiting (shared per access token, ~3 req/s average)
+    notion_rate_limit_per_second: float = 3.0
+    notion_rate_limit_burst: int = 10
+    notion_max_retries: int = 5
+    notion_retry_base_delay: float = 1.0
+    notion_retry_max_delay: float = 30.0
+
+    # Pooled Notion HTTP clients (one per access token)
+    notion_http2: bool = True  # Used when the optional h2 package is installed
+    notion_client_max_connections: int = 10
+    notion_client_idle_seconds: float = 300.0
+
+    # Cached Notion reads (database schemas, database lists, page searches)
+    notion_cache_max_entries: int = 1024
+    notion_schema_cache_ttl_seconds: float = 300.0
+    notion_search_cache_ttl_seconds: float = 60.0
+
+    # Sync engine
+    sync_max_concurrent_writes: int = 5
+    sync_max_concurrent_users: int = 4  # Users of a config doing Notion work at once, waiting users still share the scan
+    sync_full_scan_interval_minutes: int = 360  # Deletion detection cadence
+    sync_local_filtering: bool = True  # Evaluate RowFilters in-process on one shared source scan
+    sync_checkpoint_every_batches: int = 5  # Save resumable progress every N source batches
+    sync_checkpoint_max_age_minutes: int = 120  # Older checkpoints (and their cursors) are discarded
+    sync_profile_config_ids: str = ""  # Comma separated config ids profiled on every sync
+    sync_profile_keep: int = 5  # Profiles kept per config
+    sync_profile_lag_interval_ms: int = 50  # Event loop lag sampling period
+    sync_progress_interval_seconds: float = 1.0  # How often a running sync publishes live progress
+
+    # Scheduled syncs
+    sync_scheduler_interval_seconds: int = 60  # How often beat looks for due configs
+    sync_schedule_jitter_ratio: float = 0.1  # Spread next runs by up to this share of the interval
+    sync_max_queued: int = 50  # Stop scheduling while this many syncs are queued or running
+    sync_queue_stale_minutes: int = 60  # Older queued/running logs don't count as queue depth
+    sync_fair_quantum: float = 4.0  # Mirrors each tenant may queue per round-robin round
+    sync_max_pending_per_tenant: int = 5  # Queued/running scheduled syncs per owner or workspace
+    sync_fair_candidates: int = 500  # Due configs considered per tick
+    sync_lease_seconds: int = 120  # Per-config sync lock, renewed every third of this while running
+
+    # Celery worker
+    sync_worker_shared_loop: bool = True  # Run tasks on one long-lived event loop per worker process
+    sync_worker_io_threads: int = 8  # Threads running lease heartbeats and progress events off that loop
+
+    # Prometheus metrics (served at /metrics by the API and on this port by workers, 0 disables)
+    metrics_worker_port: int = 9100
+
     # JWT
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440
+    sync_events_token_seconds: int = 60  # Lifetime of the URL token that opens one config's sync event stream
 
     # App
     environment: str = "development"
@@ -27,6 +74,10 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def sync_profile_config_id_list(self) -> List[int]:
+        return [int(config_id) for config_id in self.sync_profile_config_ids.split(",") if config_id.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = False
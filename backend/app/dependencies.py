@@ -1,11 +1,13 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.utils.security import decode_access_token
+from app.utils.security import SYNC_EVENTS_SCOPE, decode_access_token
 from app.models import User
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 def get_current_user(
@@ -13,15 +15,54 @@ def get_current_user(
     db: Session = Depends(get_db)
 ) -> User:
     """Get current authenticated user from JWT token"""
-    token = credentials.credentials
+    return _user_from_token(credentials.credentials, db)
+
+
+def get_sync_events_user(
+    config_id: int,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Like get_current_user, but also accepts a `token` query parameter,
+    since browsers' EventSource can't send headers. Only the short-lived
+    token from POST /sync/{config_id}/events/token is accepted there, and
+    only for that config's stream."""
+    if credentials:
+        return _user_from_token(credentials.credentials, db)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+
     payload = decode_access_token(token)
+    if (
+        payload is None
+        or payload.get("scope") != SYNC_EVENTS_SCOPE
+        or payload.get("config_id") != config_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+    return _user_from_payload(payload, db)
+
 
-    if payload is None:
+def _user_from_token(token: str, db: Session) -> User:
+    payload = decode_access_token(token)
+
+    # Scoped tokens (e.g. for the sync event stream) aren't API credentials
+    if payload is None or payload.get("scope") is not None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
 
+    return _user_from_payload(payload, db)
+
+
+def _user_from_payload(payload: dict, db: Session) -> User:
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
@@ -4,6 +4,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from app.config import settings
 from app.routers import auth, databases, configs, sync
 from app.database import engine, Base
+from app.services.notion_clients import close_notion_clients
+from app.services.sync_events import progress_listener
+from app.utils.metrics import render_metrics
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -46,6 +49,17 @@ app.include_router(configs.router, prefix="/api/v1")
 app.include_router(sync.router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+def startup():
+    progress_listener.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    progress_listener.stop()
+    await close_notion_clients()
+
+
 @app.get("/")
 def root():
     return {
@@ -58,3 +72,9 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -5,6 +5,8 @@ from app.models.property_mapping import PropertyMapping
 from app.models.user_permission import UserPermission
 from app.models.sync_log import SyncLog
 from app.models.page_mapping import PageMapping
+from app.models.sync_profile import SyncProfile
+from app.models.scheduler_credit import SchedulerCredit
 
 __all__ = [
     "User",
@@ -14,4 +16,6 @@ __all__ = [
     "UserPermission",
     "SyncLog",
     "PageMapping",
+    "SyncProfile",
+    "SchedulerCredit",
 ]
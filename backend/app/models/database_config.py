@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,6 +15,12 @@ class DatabaseConfig(Base):
     sync_enabled = Column(Boolean, default=True)
     sync_interval_minutes = Column(Integer, default=15)
     last_sync_at = Column(DateTime(timezone=True), nullable=True)
+    next_sync_at = Column(DateTime(timezone=True), server_default=func.now())  # When the scheduler should queue the next sync
+    # Lease held by the sync currently running for this config
+    sync_lease_owner = Column(String(255), nullable=True)
+    sync_lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    sync_rerun_requested = Column(Boolean, default=False, nullable=False, server_default="false")
+    profile_next_sync = Column(Boolean, default=False, nullable=False, server_default="false")  # One-shot profiling
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -24,3 +30,8 @@ class DatabaseConfig(Base):
     user_permissions = relationship("UserPermission", back_populates="config", cascade="all, delete-orphan")
     sync_logs = relationship("SyncLog", back_populates="config", cascade="all, delete-orphan")
     page_mappings = relationship("PageMapping", back_populates="config", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # The scheduler's due-config lookup is a range scan on this index
+        Index("ix_database_configs_due", "sync_enabled", "next_sync_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -9,13 +9,19 @@ class PageMapping(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     config_id = Column(Integer, ForeignKey("database_configs.id", ondelete="CASCADE"), nullable=False)
+    user_permission_id = Column(Integer, ForeignKey("user_permissions.id", ondelete="CASCADE"), nullable=False)
     source_page_id = Column(String(255), nullable=False)
     target_page_id = Column(String(255), nullable=False)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Hash of the filtered properties last written
+    mirror_hash = Column(String(64), nullable=True)  # Hash of the mirror's writable properties as last seen
+    seen_in_scan = Column(String(32), nullable=True)  # Last full scan that found the source row
 
     # Relationships
     config = relationship("DatabaseConfig", back_populates="page_mappings")
+    user_permission = relationship("UserPermission", back_populates="page_mappings")
 
     __table_args__ = (
-        UniqueConstraint('config_id', 'source_page_id', name='unique_config_source_page'),
+        # Each user's mirror maps a source page at most once
+        Index('ix_page_mappings_user_permission_source', 'user_permission_id', 'source_page_id', unique=True),
     )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Float, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SchedulerCredit(Base):
+    """Fair scheduler credit a tenant carries over to the next tick"""
+    __tablename__ = "scheduler_credits"
+
+    tenant_key = Column(String(255), primary_key=True)  # 'workspace:<id>' or 'owner:<id>'
+    deficit = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -9,14 +9,16 @@ class SyncLog(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     config_id = Column(Integer, ForeignKey("database_configs.id", ondelete="CASCADE"), nullable=False)
-    sync_type = Column(String(50), nullable=True)  # 'manual', 'scheduled', 'webhook'
-    status = Column(String(50), nullable=True)  # 'success', 'error', 'partial'
+    sync_type = Column(String(50), nullable=True)  # 'manual', 'scheduled', 'follow_up', 'webhook'
+    status = Column(String(50), nullable=True)  # 'queued', 'running', 'success', 'error', 'partial', 'coalesced'
     rows_created = Column(Integer, default=0)
     rows_updated = Column(Integer, default=0)
     rows_deleted = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    timings = Column(JSON, nullable=True)  # Seconds per phase, overall and per user mirror
 
     # Relationships
     config = relationship("DatabaseConfig", back_populates="sync_logs")
+    profile = relationship("SyncProfile", back_populates="sync_log", uselist=False, cascade="all, delete-orphan")
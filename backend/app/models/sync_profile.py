@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, LargeBinary, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class SyncProfile(Base):
+    __tablename__ = "sync_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sync_log_id = Column(Integer, ForeignKey("sync_logs.id", ondelete="CASCADE"), nullable=False, unique=True)
+    config_id = Column(Integer, ForeignKey("database_configs.id", ondelete="CASCADE"), nullable=False, index=True)
+    cpu_profile = Column(LargeBinary, nullable=False)  # zlib-compressed pstats dump
+    loop_lag = Column(JSON, nullable=True)  # Event loop lag histogram and percentiles
+    summary = Column(Text, nullable=True)  # Top functions by cumulative time
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    sync_log = relationship("SyncLog", back_populates="profile")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Table
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, UniqueConstraint, Table, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -26,11 +26,19 @@ class UserPermission(Base):
     target_database_id = Column(String(255), nullable=True)  # Mirror database in user's page
 
     notified = Column(Boolean, default=False)
+
+    # Incremental sync state: max source last_edited_time already mirrored
+    last_source_edited_at = Column(DateTime(timezone=True), nullable=True)
+    last_full_sync_at = Column(DateTime(timezone=True), nullable=True)
+    # Progress of an interrupted source -> mirror pass, resumed by the next sync
+    sync_checkpoint = Column(JSON, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     config = relationship("DatabaseConfig", back_populates="user_permissions")
     row_filters = relationship("RowFilter", secondary=user_permission_row_filters, back_populates="user_permissions")
+    page_mappings = relationship("PageMapping", back_populates="user_permission", cascade="all, delete-orphan")
 
     __table_args__ = (
         UniqueConstraint('config_id', 'user_email', name='unique_config_user'),
@@ -4,6 +4,7 @@ from typing import List
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.models import User, DatabaseConfig, PropertyMapping, RowFilter, UserPermission
+from app.services.scheduler import reschedule_config
 from app.schemas import (
     DatabaseConfigCreate,
     DatabaseConfigUpdate,
@@ -131,6 +132,9 @@ def update_config(
     for field, value in update_data.items():
         setattr(config, field, value)
 
+    if "sync_interval_minutes" in update_data:
+        reschedule_config(config)
+
     db.commit()
     db.refresh(config)
 
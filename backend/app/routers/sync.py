@@ -1,23 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.dependencies import get_current_user
-from app.models import User, DatabaseConfig, SyncLog
-from app.schemas import SyncLogResponse, SyncTriggerResponse
-from app.services.sync import NotionSyncEngine
+from typing import Any, Dict, List
+from datetime import datetime
+import asyncio
+import json
+from app.database import SessionLocal, get_db
+from app.dependencies import get_current_user, get_sync_events_user
+from app.models import User, DatabaseConfig, SyncLog, SyncProfile
+from app.schemas import SyncLogResponse, SyncTriggerResponse, SyncEventsTokenResponse
+from app.services.profiling import load_cpu_profile
+from app.services.sync_events import broker
+from app.services.sync_lock import get_pending_sync_log, request_rerun
+from app.tasks.celery_app import MANUAL_SYNC_QUEUE
+from app.tasks.sync_tasks import sync_database as sync_database_task
+from app.utils.security import create_sync_events_token
+from app.config import settings
 
 router = APIRouter(prefix="/sync", tags=["synchronization"])
 
+# Comment line sent on idle event streams so proxies don't close them
+SSE_KEEPALIVE_SECONDS = 15
 
-@router.post("/{config_id}/trigger", response_model=SyncTriggerResponse)
-async def trigger_sync(
+
+@router.post("/{config_id}/trigger", response_model=SyncTriggerResponse, status_code=202)
+def trigger_sync(
     config_id: int,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Trigger a manual sync for a configuration"""
+    """Queue a manual sync for a configuration, poll its log for progress"""
     config = db.query(DatabaseConfig).filter(
         DatabaseConfig.id == config_id,
         DatabaseConfig.owner_user_id == current_user.id
@@ -26,18 +39,45 @@ async def trigger_sync(
     if not config:
         raise HTTPException(status_code=404, detail="Configuration not found")
 
-    # Run sync
-    try:
-        sync_engine = NotionSyncEngine(db)
-        sync_log = await sync_engine.sync_database(config_id)
-
+    # Join a sync that hasn't started yet, or coalesce into one follow-up
+    # run of the sync in progress, instead of running in parallel
+    pending = get_pending_sync_log(db, config_id)
+    if pending and pending.status == "queued":
         return {
-            "message": "Sync completed successfully",
-            "sync_log_id": sync_log.id,
-            "status": sync_log.status
+            "message": "Sync already queued",
+            "sync_log_id": pending.id,
+            "status": pending.status
         }
+    if pending and request_rerun(db, config_id):
+        return {
+            "message": "Sync already running, a follow-up run will start when it completes",
+            "sync_log_id": pending.id,
+            "status": pending.status
+        }
+
+    # Create the log up front so the client has something to poll
+    sync_log = SyncLog(
+        config_id=config_id,
+        sync_type="manual",
+        status="queued"
+    )
+    db.add(sync_log)
+    db.commit()
+
+    try:
+        sync_database_task.apply_async(args=(config_id, sync_log.id, "manual"), queue=MANUAL_SYNC_QUEUE)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
+        sync_log.status = "error"
+        sync_log.error_message = f"Failed to queue sync: {str(e)}"
+        sync_log.completed_at = datetime.utcnow()
+        db.commit()
+        raise HTTPException(status_code=503, detail=f"Failed to queue sync: {str(e)}")
+
+    return {
+        "message": "Sync queued",
+        "sync_log_id": sync_log.id,
+        "status": sync_log.status
+    }
 
 
 @router.get("/{config_id}/status")
@@ -68,6 +108,90 @@ def get_sync_status(
     }
 
 
+def _sync_status_event(config_id: int) -> Dict[str, Any]:
+    """Current status of a config, the first event of a stream"""
+    db = SessionLocal()
+    try:
+        config = db.query(DatabaseConfig).filter(DatabaseConfig.id == config_id).first()
+        latest_sync = db.query(SyncLog).filter(
+            SyncLog.config_id == config_id
+        ).order_by(SyncLog.started_at.desc()).first()
+        return {
+            "type": "status",
+            "config_id": config_id,
+            "sync_enabled": config.sync_enabled if config else False,
+            "last_sync_at": config.last_sync_at if config else None,
+            "latest_sync_log": SyncLogResponse.model_validate(latest_sync).model_dump() if latest_sync else None
+        }
+    finally:
+        db.close()
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.post("/{config_id}/events/token", response_model=SyncEventsTokenResponse)
+def create_events_token(
+    config_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Short-lived token for opening GET /events from an EventSource"""
+    config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == config_id,
+        DatabaseConfig.owner_user_id == current_user.id
+    ).first()
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    return {
+        "token": create_sync_events_token(current_user.id, config_id),
+        "expires_in": settings.sync_events_token_seconds
+    }
+
+
+@router.get("/{config_id}/events")
+def stream_sync_events(
+    config_id: int,
+    current_user: User = Depends(get_sync_events_user),
+    db: Session = Depends(get_db)
+):
+    """Server-Sent Events stream of a configuration's syncs.
+
+    Starts with a `status` event like GET /status, then pushes `progress`
+    events while a sync runs (rows fetched, written and skipped per user,
+    current phase, ETA) and a `finished` event when it ends. Clients that can't set
+    headers pass a token from POST /events/token as `?token=` instead.
+    """
+    config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == config_id,
+        DatabaseConfig.owner_user_id == current_user.id
+    ).first()
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    async def events():
+        # Subscribe before reading the status so no event falls in between
+        with broker.subscribe(config_id) as queue:
+            yield _sse(await run_in_threadpool(_sync_status_event, config_id))
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{config_id}/logs", response_model=List[SyncLogResponse])
 def get_sync_logs(
     config_id: int,
@@ -91,6 +215,97 @@ def get_sync_logs(
     return logs
 
 
+@router.get("/{config_id}/logs/{sync_log_id}", response_model=SyncLogResponse)
+def get_sync_log(
+    config_id: int,
+    sync_log_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a single sync log, e.g. to poll a queued sync"""
+    config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == config_id,
+        DatabaseConfig.owner_user_id == current_user.id
+    ).first()
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    sync_log = db.query(SyncLog).filter(
+        SyncLog.id == sync_log_id,
+        SyncLog.config_id == config_id
+    ).first()
+
+    if not sync_log:
+        raise HTTPException(status_code=404, detail="Sync log not found")
+
+    return sync_log
+
+
+@router.get("/{config_id}/logs/{sync_log_id}/profile")
+def download_sync_profile(
+    config_id: int,
+    sync_log_id: int,
+    format: str = "pstats",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Download the profile of a sync: a pstats file, or a text report with event loop lag"""
+    config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == config_id,
+        DatabaseConfig.owner_user_id == current_user.id
+    ).first()
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    profile = db.query(SyncProfile).filter(
+        SyncProfile.sync_log_id == sync_log_id,
+        SyncProfile.config_id == config_id
+    ).first()
+
+    if not profile:
+        raise HTTPException(status_code=404, detail="No profile recorded for this sync")
+
+    if format == "text":
+        lag = json.dumps(profile.loop_lag, indent=2)
+        return PlainTextResponse(f"Event loop lag:\n{lag}\n\n{profile.summary or ''}")
+    if format != "pstats":
+        raise HTTPException(status_code=400, detail="format must be 'pstats' or 'text'")
+
+    return Response(
+        content=load_cpu_profile(profile.cpu_profile),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="sync-{config_id}-{sync_log_id}.prof"'}
+    )
+
+
+@router.put("/{config_id}/profile")
+def profile_next_sync(
+    config_id: int,
+    enabled: bool = True,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Profile the next sync of a configuration"""
+    config = db.query(DatabaseConfig).filter(
+        DatabaseConfig.id == config_id,
+        DatabaseConfig.owner_user_id == current_user.id
+    ).first()
+
+    if not config:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    config.profile_next_sync = enabled
+    db.commit()
+
+    return {
+        "message": f"Next sync will {'' if enabled else 'not '}be profiled",
+        "config_id": config_id,
+        "profile_next_sync": enabled
+    }
+
+
 @router.put("/{config_id}/enable")
 def toggle_sync(
     config_id: int,
@@ -10,7 +10,7 @@ from app.schemas.config import (
     UserPermissionCreate,
     UserPermissionResponse,
 )
-from app.schemas.sync import SyncLogResponse, SyncTriggerResponse
+from app.schemas.sync import SyncLogResponse, SyncTriggerResponse, SyncEventsTokenResponse
 from app.schemas.notion import NotionDatabaseInfo, NotionPropertyInfo
 
 __all__ = [
@@ -29,6 +29,7 @@ __all__ = [
     "UserPermissionResponse",
     "SyncLogResponse",
     "SyncTriggerResponse",
+    "SyncEventsTokenResponse",
     "NotionDatabaseInfo",
     "NotionPropertyInfo",
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class SyncLogResponse(BaseModel):
@@ -14,6 +14,7 @@ class SyncLogResponse(BaseModel):
     error_message: Optional[str]
     started_at: datetime
     completed_at: Optional[datetime]
+    timings: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True
@@ -23,3 +24,8 @@ class SyncTriggerResponse(BaseModel):
     message: str
     sync_log_id: Optional[int] = None
     status: str
+
+
+class SyncEventsTokenResponse(BaseModel):
+    token: str
+    expires_in: int
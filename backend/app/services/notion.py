@@ -1,19 +1,131 @@
-from notion_client import AsyncClient
-from typing import Dict, Any, List, Optional
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from app.config import settings
+from app.services.notion_clients import get_notion_client
 from app.utils.notion_helpers import extract_title_from_database, extract_title_from_page
+from app.utils.cache import AsyncTTLCache
+from app.utils.metrics import (
+    NOTION_RATE_LIMIT_WAIT_SECONDS,
+    NOTION_RATE_LIMITED,
+    NOTION_REQUEST_SECONDS,
+    NOTION_REQUESTS,
+)
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.security import token_fingerprint
+from functools import partial
 import asyncio
+import httpx
+import random
+import time
+
+
+def _endpoint_name(method) -> str:
+    """Metric label for a client method, e.g. 'databases.query' or 'search'"""
+    owner = getattr(method, "__self__", None)
+    if owner is None:
+        # Endpoints like client.search are callable objects
+        return type(method).__name__.removesuffix("Endpoint").lower()
+    return f"{type(owner).__name__.removesuffix('Endpoint').lower()}.{method.__name__}"
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from a Notion error response"""
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared by every NotionService in the process, keyed by token + resource
+_schema_cache = AsyncTTLCache(
+    maxsize=settings.notion_cache_max_entries,
+    ttl=settings.notion_schema_cache_ttl_seconds
+)
+_listing_cache = AsyncTTLCache(
+    maxsize=settings.notion_cache_max_entries,
+    ttl=settings.notion_search_cache_ttl_seconds
+)
 
 
 class NotionService:
     """Service for interacting with Notion API"""
 
     def __init__(self, access_token: str):
-        self.client = AsyncClient(auth=access_token)
+        self.client = get_notion_client(access_token)
+        self.rate_limiter = get_rate_limiter(access_token)
+        self._token_key = token_fingerprint(access_token)
+
+    def _invalidate_listings(self):
+        """Drop cached database lists and page searches after creating objects"""
+        _listing_cache.invalidate_where(lambda key: key[0] == self._token_key)
+
+    async def _request(self, method, idempotent: bool = True, **kwargs) -> Any:
+        """Call a Notion client method once the shared rate budget allows it.
+
+        Rate limits (429) are always retried after Retry-After, server errors
+        and timeouts only for idempotent calls so a create is never duplicated.
+        """
+        endpoint = _endpoint_name(method)
+        attempt = 0
+        while True:
+            waited = await self.rate_limiter.acquire()
+            if waited:
+                NOTION_RATE_LIMIT_WAIT_SECONDS.labels(endpoint).inc(waited)
+            started_at = time.perf_counter()
+            try:
+                result = await method(**kwargs)
+            except (HTTPResponseError, RequestTimeoutError, httpx.TransportError) as e:
+                status = getattr(e, "status", None)
+                NOTION_REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - started_at)
+                NOTION_REQUESTS.labels(endpoint, status or "error").inc()
+                rate_limited = status == 429
+                if rate_limited:
+                    NOTION_RATE_LIMITED.labels(endpoint).inc()
+                # Timeouts and transport errors have no status
+                server_error = status is None or status >= 500
+                retryable = (
+                    rate_limited
+                    or isinstance(e, httpx.ConnectError)
+                    or (idempotent and server_error)
+                )
+                if not retryable or attempt >= settings.notion_max_retries:
+                    raise
+
+                retry_after = _retry_after_seconds(e)
+                if rate_limited:
+                    # Pauses every caller sharing this token, acquire() waits it out
+                    self.rate_limiter.throttle(retry_after)
+                    delay = random.uniform(0, settings.notion_retry_base_delay)
+                else:
+                    delay = retry_after or random.uniform(0, min(
+                        settings.notion_retry_max_delay,
+                        settings.notion_retry_base_delay * 2 ** attempt
+                    ))
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            NOTION_REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - started_at)
+            NOTION_REQUESTS.labels(endpoint, 200).inc()
+            self.rate_limiter.recover()
+            return result
 
     async def get_databases(self) -> List[Dict[str, Any]]:
-        """List all databases the integration has access to"""
+        """List all databases the integration has access to (cached)"""
+        return await _listing_cache.get_or_load(
+            (self._token_key, "databases"),
+            self._fetch_databases
+        )
+
+    async def _fetch_databases(self) -> List[Dict[str, Any]]:
         try:
-            response = await self.client.search(filter={"property": "object", "value": "database"})
+            response = await self._request(
+                self.client.search,
+                filter={"property": "object", "value": "database"}
+            )
             databases = []
             for db in response.get("results", []):
                 databases.append({
@@ -26,9 +138,23 @@ class NotionService:
             raise Exception(f"Failed to fetch databases: {str(e)}")
 
     async def get_database_schema(self, db_id: str) -> Dict[str, Any]:
-        """Get database schema (properties)"""
+        """Get database schema (properties), cached until it expires or drifts"""
+        return await _schema_cache.get_or_load(
+            (self._token_key, "schema", db_id),
+            partial(self._fetch_database_schema, db_id)
+        )
+
+    def cached_database_schema(self, db_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached schema, if any, without calling the API"""
+        return _schema_cache.get((self._token_key, "schema", db_id))
+
+    def invalidate_database_schema(self, db_id: str):
+        """Forget a cached schema, e.g. after a sync detected drift"""
+        _schema_cache.invalidate((self._token_key, "schema", db_id))
+
+    async def _fetch_database_schema(self, db_id: str) -> Dict[str, Any]:
         try:
-            database = await self.client.databases.retrieve(database_id=db_id)
+            database = await self._request(self.client.databases.retrieve, database_id=db_id)
             properties = database.get("properties", {})
 
             schema = {
@@ -49,41 +175,56 @@ class NotionService:
         except Exception as e:
             raise Exception(f"Failed to fetch database schema: {str(e)}")
 
-    async def query_database(
+    async def iter_database_pages(
         self,
         db_id: str,
         filter_obj: Optional[Dict[str, Any]] = None,
-        page_size: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Query database with optional filters"""
-        try:
-            all_results = []
-            has_more = True
-            start_cursor = None
-
-            while has_more:
-                query_params = {"page_size": page_size}
-                if filter_obj:
-                    query_params["filter"] = filter_obj
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-
-                response = await self.client.databases.query(
+        page_size: int = 100,
+        start_cursor: Optional[str] = None
+    ) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Query database page by page, yielding (results, cursor of the next page)"""
+        while True:
+            query_params = {"page_size": page_size}
+            if filter_obj:
+                query_params["filter"] = filter_obj
+            if start_cursor:
+                query_params["start_cursor"] = start_cursor
+
+            try:
+                response = await self._request(
+                    self.client.databases.query,
                     database_id=db_id,
                     **query_params
                 )
+            except Exception as e:
+                raise Exception(f"Failed to query database: {str(e)}")
 
-                all_results.extend(response.get("results", []))
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
+            start_cursor = response.get("next_cursor") if response.get("has_more") else None
+            yield response.get("results", []), start_cursor
+            if not start_cursor:
+                return
 
-                # Rate limiting
-                if has_more:
-                    await asyncio.sleep(0.35)  # ~3 req/sec
+    async def iter_database(
+        self,
+        db_id: str,
+        filter_obj: Optional[Dict[str, Any]] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Query database with optional filters, yielding each batch of results as it arrives"""
+        async for batch, _ in self.iter_database_pages(db_id, filter_obj, page_size):
+            yield batch
 
-            return all_results
-        except Exception as e:
-            raise Exception(f"Failed to query database: {str(e)}")
+    async def query_database(
+        self,
+        db_id: str,
+        filter_obj: Optional[Dict[str, Any]] = None,
+        page_size: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Query database with optional filters"""
+        all_results = []
+        async for batch in self.iter_database(db_id, filter_obj, page_size):
+            all_results.extend(batch)
+        return all_results
 
     async def create_database(
         self,
@@ -93,11 +234,14 @@ class NotionService:
     ) -> Dict[str, Any]:
         """Create a new database"""
         try:
-            database = await self.client.databases.create(
+            database = await self._request(
+                self.client.databases.create,
+                idempotent=False,
                 parent={"type": "page_id", "page_id": parent_page_id},
                 title=[{"type": "text", "text": {"content": title}}],
                 properties=properties
             )
+            self._invalidate_listings()
             return database
         except Exception as e:
             raise Exception(f"Failed to create database: {str(e)}")
@@ -105,7 +249,9 @@ class NotionService:
     async def create_page(self, db_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Create a page (row) in a database"""
         try:
-            page = await self.client.pages.create(
+            page = await self._request(
+                self.client.pages.create,
+                idempotent=False,
                 parent={"database_id": db_id},
                 properties=properties
             )
@@ -116,7 +262,8 @@ class NotionService:
     async def update_page(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Update a page (row)"""
         try:
-            page = await self.client.pages.update(
+            page = await self._request(
+                self.client.pages.update,
                 page_id=page_id,
                 properties=properties
             )
@@ -127,7 +274,8 @@ class NotionService:
     async def archive_page(self, page_id: str) -> Dict[str, Any]:
         """Archive (soft delete) a page"""
         try:
-            page = await self.client.pages.update(
+            page = await self._request(
+                self.client.pages.update,
                 page_id=page_id,
                 archived=True
             )
@@ -138,15 +286,22 @@ class NotionService:
     async def get_page(self, page_id: str) -> Dict[str, Any]:
         """Get a page by ID"""
         try:
-            page = await self.client.pages.retrieve(page_id=page_id)
+            page = await self._request(self.client.pages.retrieve, page_id=page_id)
             return page
         except Exception as e:
             raise Exception(f"Failed to get page: {str(e)}")
 
     async def search_pages(self, query: str = "") -> List[Dict[str, Any]]:
-        """Search for pages"""
+        """Search for pages (cached)"""
+        return await _listing_cache.get_or_load(
+            (self._token_key, "search", query),
+            partial(self._search_pages, query)
+        )
+
+    async def _search_pages(self, query: str) -> List[Dict[str, Any]]:
         try:
-            response = await self.client.search(
+            response = await self._request(
+                self.client.search,
                 query=query,
                 filter={"property": "object", "value": "page"}
             )
@@ -164,12 +319,15 @@ class NotionService:
     async def create_page_in_parent(self, parent_page_id: str, title: str) -> Dict[str, Any]:
         """Create a new page as a child of another page"""
         try:
-            page = await self.client.pages.create(
+            page = await self._request(
+                self.client.pages.create,
+                idempotent=False,
                 parent={"type": "page_id", "page_id": parent_page_id},
                 properties={
                     "title": [{"type": "text", "text": {"content": title}}]
                 }
             )
+            self._invalidate_listings()
             return page
         except Exception as e:
             raise Exception(f"Failed to create page in parent: {str(e)}")
@@ -179,7 +337,8 @@ class NotionService:
         try:
             # Add user as a page member with read access
             # Note: Notion API requires the user to have a Notion account
-            response = await self.client.pages.update(
+            response = await self._request(
+                self.client.pages.update,
                 page_id=page_id,
                 properties={}  # No property changes
             )
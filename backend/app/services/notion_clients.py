@@ -0,0 +1,89 @@
+from notion_client import AsyncClient
+from typing import Dict, Optional
+from app.config import settings
+from app.utils.security import token_fingerprint
+import asyncio
+import importlib.util
+import time
+import weakref
+import httpx
+
+
+class _PooledClient:
+    def __init__(self, access_token: str):
+        self.last_used = time.monotonic()
+        # Touched on every request, not only when handed out: a long sync
+        # keeps using the client it got at the start
+        self.client = _create_client(access_token, event_hooks={"request": [self._touch], "response": [self._touch]})
+
+    async def _touch(self, _):
+        self.last_used = time.monotonic()
+
+
+# httpx connection pools belong to the event loop that opened them, so clients
+# are pooled per running loop and then per access token
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _PooledClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# Replaces the network for every new client, e.g. with the benchmarks' fake Notion API
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def set_notion_transport(transport: Optional[httpx.AsyncBaseTransport]):
+    """Route new Notion clients through `transport` (None restores the network)"""
+    global _transport
+    _transport = transport
+
+
+def _http2_available() -> bool:
+    return settings.notion_http2 and importlib.util.find_spec("h2") is not None
+
+
+def _create_client(access_token: str, event_hooks: Optional[Dict[str, list]] = None) -> AsyncClient:
+    http_client = httpx.AsyncClient(
+        transport=_transport,
+        event_hooks=event_hooks,
+        http2=_http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.notion_client_max_connections,
+            max_keepalive_connections=settings.notion_client_max_connections,
+            keepalive_expiry=settings.notion_client_idle_seconds,
+        ),
+    )
+    return AsyncClient(auth=access_token, client=http_client)
+
+
+def _evict_idle(pool: Dict[str, _PooledClient], loop: asyncio.AbstractEventLoop):
+    cutoff = time.monotonic() - settings.notion_client_idle_seconds
+    for key, entry in list(pool.items()):
+        if entry.last_used < cutoff:
+            del pool[key]
+            loop.create_task(entry.client.aclose())
+
+
+def get_notion_client(access_token: str) -> AsyncClient:
+    """Return a keep-alive Notion client for this token, shared within the running loop"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Outside a loop there is nothing to share the connection pool with
+        return _create_client(access_token)
+
+    pool = _pools.setdefault(loop, {})
+    _evict_idle(pool, loop)
+
+    key = token_fingerprint(access_token)
+    entry = pool.get(key)
+    if entry is None:
+        entry = pool[key] = _PooledClient(access_token)
+    entry.last_used = time.monotonic()
+    return entry.client
+
+
+async def close_notion_clients():
+    """Close every pooled client of the running loop (call before the loop ends)"""
+    pool = _pools.pop(asyncio.get_running_loop(), {})
+    for entry in pool.values():
+        await entry.client.aclose()
@@ -0,0 +1,141 @@
+from typing import Dict, Any, AsyncIterator, Optional
+from datetime import datetime, timezone
+import asyncio
+
+
+class SharedPageStream:
+    """Fan out one paginated Notion query to the consumers reading it together.
+
+    A background task fetches result batches ahead of the consumers, so
+    writing one batch overlaps fetching the next. It stays at most
+    `prefetch` batches ahead of the slowest consumer, which bounds the
+    buffer: faster consumers wait for the slower ones instead of the
+    whole result piling up in memory. A batch is dropped once every
+    consumer has read it, and a consumer that stops, finished or failed,
+    releases its place.
+
+    Consumers can only join while the first batch is still buffered (see
+    `joinable`), later ones need a stream of their own. To share one scan
+    between consumers that start at different times, `reserve` a place for
+    each of them up front.
+    """
+
+    def __init__(
+        self,
+        batches: AsyncIterator[Any],
+        prefetch: int = 2
+    ):
+        self.started_at = datetime.now(timezone.utc)
+        self._source = batches
+        self._prefetch = max(1, prefetch)
+        self._batches: Dict[int, Any] = {}
+        # Index of the next batch each active consumer reads
+        self._positions: Dict[int, int] = {}
+        self._consumers = 0
+        self._produced = 0
+        self._dropped = 0
+        self._done = False
+        self._abandoned = False
+        self._error: Optional[Exception] = None
+        self._changed = asyncio.Condition()
+        self._producer: Optional[asyncio.Task] = None
+
+    @property
+    def joinable(self) -> bool:
+        """Whether a new consumer would still see every batch"""
+        return not self._dropped and not self._abandoned and self._error is None
+
+    @property
+    def buffered(self) -> int:
+        """Batches held in memory right now"""
+        return len(self._batches)
+
+    def _ahead(self) -> int:
+        return self._produced - min(self._positions.values(), default=self._produced)
+
+    async def _produce(self):
+        try:
+            async for batch in self._source:
+                async with self._changed:
+                    self._batches[self._produced] = batch
+                    self._produced += 1
+                    self._changed.notify_all()
+                    await self._changed.wait_for(
+                        lambda: not self._positions or self._ahead() < self._prefetch
+                    )
+                    if not self._positions:
+                        # Every consumer left, nobody needs the rest
+                        self._abandoned = True
+                        return
+        except Exception as e:
+            self._error = e
+        finally:
+            async with self._changed:
+                self._done = True
+                self._changed.notify_all()
+
+    def _drop_read_batches(self):
+        oldest = min(self._positions.values(), default=self._produced)
+        for index in [index for index in self._batches if index < oldest]:
+            del self._batches[index]
+            self._dropped += 1
+        self._changed.notify_all()
+
+    def reserve(self) -> int:
+        """Hold a place for a consumer that starts reading later.
+
+        No batch is dropped before every reserved consumer has read it.
+        Pass the returned id to `consume`, or to `release` if the consumer
+        won't read after all.
+        """
+        if not self.joinable:
+            raise RuntimeError("Batches were already dropped, this stream can't be joined")
+        consumer = self._consumers
+        self._consumers += 1
+        self._positions[consumer] = 0
+        return consumer
+
+    async def release(self, consumer: int):
+        """Give up a consumer's place, batches only it still needed are dropped"""
+        async with self._changed:
+            if consumer in self._positions:
+                del self._positions[consumer]
+                self._drop_read_batches()
+
+    async def consume(self, consumer: Optional[int] = None) -> AsyncIterator[Any]:
+        """Iterate over every batch of the query, in order.
+
+        Reads for a consumer `reserve` returned, or joins as a new one.
+        Close the iterator (e.g. with contextlib.aclosing) when stopping
+        early, so the stream stops keeping batches for this consumer.
+        """
+        if consumer is None:
+            consumer = self.reserve()
+        elif consumer not in self._positions:
+            raise RuntimeError(f"Consumer {consumer} of this stream was released")
+        if self._producer is None:
+            self._producer = asyncio.ensure_future(self._produce())
+
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: self._positions[consumer] < self._produced or self._done
+                    )
+                    index = self._positions[consumer]
+                    if index >= self._produced:
+                        if self._error:
+                            raise self._error
+                        return
+                    batch = self._batches[index]
+                    self._positions[consumer] = index + 1
+                    self._drop_read_batches()
+
+                yield batch
+        finally:
+            await self.release(consumer)
+
+    def close(self):
+        """Stop fetching, e.g. when consumers gave up before reading everything"""
+        if self._producer and not self._producer.done():
+            self._producer.cancel()
@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import bisect
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import zlib
+
+# Upper bounds (ms) of the event loop lag histogram buckets, the last one is open
+LAG_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+# cProfile hooks the whole thread, so only one profile can run per process
+_active = threading.Lock()
+
+
+class SyncProfiler:
+    """CPU profile and event loop lag of one sync run.
+
+    cProfile sees everything running on the loop's thread, so when other
+    syncs share the worker loop their coroutines show up in the profile
+    too. The lag sampler sleeps for a fixed interval and records how late
+    it wakes up: large values mean something blocked the loop.
+    """
+
+    def __init__(self, lag_interval: float = 0.05):
+        self.lag_interval = lag_interval
+        self._profile = cProfile.Profile()
+        self._lag_samples: List[float] = []
+        self._lag_task: Optional[asyncio.Task] = None
+        self._started = False
+
+    def start(self) -> bool:
+        """Start profiling, False if another profile is already running"""
+        if not _active.acquire(blocking=False):
+            return False
+        self._started = True
+        self._lag_task = asyncio.ensure_future(self._sample_lag())
+        self._profile.enable()
+        return True
+
+    def stop(self):
+        if not self._started:
+            return
+        self._profile.disable()
+        if self._lag_task:
+            self._lag_task.cancel()
+        self._started = False
+        _active.release()
+
+    async def _sample_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self._lag_samples.append(max(0.0, loop.time() - expected) * 1000)
+
+    def cpu_profile(self) -> bytes:
+        """The profile as a compressed pstats dump"""
+        self._profile.create_stats()
+        return zlib.compress(marshal.dumps(self._profile.stats))
+
+    def summary(self, limit: int = 40) -> str:
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def loop_lag(self) -> Dict[str, Any]:
+        samples = sorted(self._lag_samples)
+        counts = [0] * (len(LAG_BUCKETS_MS) + 1)
+        for sample in samples:
+            counts[bisect.bisect_left(LAG_BUCKETS_MS, sample)] += 1
+
+        def percentile(pct: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(len(samples) * pct / 100))], 2)
+
+        return {
+            "interval_ms": round(self.lag_interval * 1000),
+            "samples": len(samples),
+            "p50_ms": percentile(50),
+            "p99_ms": percentile(99),
+            "max_ms": round(samples[-1], 2) if samples else 0.0,
+            "buckets_ms": LAG_BUCKETS_MS + ["+Inf"],
+            "counts": counts,
+        }
+
+
+def load_cpu_profile(data: bytes) -> bytes:
+    """Turn a stored profile back into a file pstats/snakeviz can open"""
+    return zlib.decompress(data)
@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import DatabaseConfig, SchedulerCredit, SyncLog, User, UserPermission
+from app.services.sync_lock import lease_free_clause
+import random
+
+
+def compute_next_sync_at(config: DatabaseConfig, from_time: Optional[datetime] = None) -> datetime:
+    """Next time a config is due, jittered so configs don't stay in lockstep"""
+    interval = timedelta(minutes=max(1, config.sync_interval_minutes or 15))
+    jitter = interval * random.uniform(0, max(0.0, settings.sync_schedule_jitter_ratio))
+    return (from_time or datetime.utcnow()) + interval + jitter
+
+
+def reschedule_config(config: DatabaseConfig):
+    """Recompute next_sync_at after the interval changed"""
+    config.next_sync_at = compute_next_sync_at(config, config.last_sync_at)
+
+
+def tenant_key(owner_user_id: int, workspace_id: Optional[str]) -> str:
+    """Fairness unit: the owner's Notion workspace, or the owner without one"""
+    return f"workspace:{workspace_id}" if workspace_id else f"owner:{owner_user_id}"
+
+
+def get_pending_by_tenant(db: Session) -> Counter:
+    """Syncs waiting for or holding a worker, per tenant"""
+    # Logs of workers that died never complete, don't let them block scheduling
+    stale_before = datetime.utcnow() - timedelta(minutes=settings.sync_queue_stale_minutes)
+    rows = db.query(
+        DatabaseConfig.owner_user_id, User.notion_workspace_id, func.count(SyncLog.id)
+    ).select_from(SyncLog).join(
+        DatabaseConfig, SyncLog.config_id == DatabaseConfig.id
+    ).join(
+        User, DatabaseConfig.owner_user_id == User.id
+    ).filter(
+        SyncLog.status.in_(("queued", "running")),
+        SyncLog.started_at >= stale_before
+    ).group_by(DatabaseConfig.owner_user_id, User.notion_workspace_id).all()
+
+    pending = Counter()
+    for owner_user_id, workspace_id, count in rows:
+        pending[tenant_key(owner_user_id, workspace_id)] += count
+    return pending
+
+
+class FairScheduler:
+    """Deficit round-robin across tenants.
+
+    Each round every tenant with due configs earns `quantum` credits and
+    spends them on its oldest due configs, a config costing one credit per
+    user mirror it syncs. Unspent credit carries over to the next tick while
+    the tenant still has a backlog, so a large config is delayed but never
+    starved, and a tenant with many configs can't crowd out the others.
+    Tenants are also capped in how many syncs they may have in flight.
+    """
+
+    def __init__(self, quantum: float, max_pending_per_tenant: int, deficits: Optional[Dict[str, float]] = None):
+        self.quantum = max(1.0, quantum)
+        self.max_pending_per_tenant = max_pending_per_tenant
+        # Credit carried over from earlier ticks, per tenant
+        self.deficits: Dict[str, float] = dict(deficits or {})
+
+    def pick(
+        self,
+        candidates: List[Tuple[str, float, DatabaseConfig]],
+        pending: Counter,
+        limit: int
+    ) -> List[DatabaseConfig]:
+        """Choose up to `limit` configs from (tenant, cost, config) in due order"""
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        for tenant, cost, config in candidates:
+            queues.setdefault(tenant, deque()).append((cost, config))
+
+        picked: List[DatabaseConfig] = []
+        pending = Counter(pending)
+        # Tenants whose oldest config is the most overdue go first
+        active = [t for t in queues if pending[t] < self.max_pending_per_tenant]
+
+        while active and len(picked) < limit:
+            for tenant in list(active):
+                queue = queues[tenant]
+                deficit = self.deficits.get(tenant, 0.0) + self.quantum
+                while (
+                    queue and queue[0][0] <= deficit
+                    and len(picked) < limit
+                    and pending[tenant] < self.max_pending_per_tenant
+                ):
+                    cost, config = queue.popleft()
+                    deficit -= cost
+                    pending[tenant] += 1
+                    picked.append(config)
+                self.deficits[tenant] = deficit
+
+                if not queue or pending[tenant] >= self.max_pending_per_tenant:
+                    active.remove(tenant)
+                if len(picked) >= limit:
+                    break
+
+        # Only tenants left with a backlog keep their credit
+        for tenant in list(self.deficits):
+            if not queues.get(tenant):
+                del self.deficits[tenant]
+
+        return picked
+
+
+# Identifies the scheduler tick's advisory lock
+SCHEDULER_LOCK_ID = 0x5C4ED
+
+
+def _lock_scheduler(db: Session) -> bool:
+    """Serialize scheduler ticks until the transaction ends, False if another tick holds the lock"""
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return db.execute(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": SCHEDULER_LOCK_ID}).scalar()
+
+
+def _load_deficits(db: Session) -> Dict[str, float]:
+    return {credit.tenant_key: credit.deficit for credit in db.query(SchedulerCredit).all()}
+
+
+def _save_deficits(db: Session, deficits: Dict[str, float]):
+    # Only tenants with a backlog have credit, the table stays small
+    db.execute(delete(SchedulerCredit))
+    if deficits:
+        db.execute(insert(SchedulerCredit), [
+            {"tenant_key": tenant, "deficit": deficit} for tenant, deficit in deficits.items()
+        ])
+
+
+def claim_due_configs(db: Session, limit: int, pending: Counter) -> List[DatabaseConfig]:
+    """Fairly pick up to `limit` due configs and push their next_sync_at forward.
+
+    Moving next_sync_at at claim time keeps the next scheduler tick from
+    queueing the same config again, the engine reschedules it from the
+    actual completion time once the sync ran. Due configs that weren't
+    picked stay due for the next tick.
+
+    Ticks can run in any worker process, so the tenants' carried-over
+    credit is kept in the database and ticks are serialized on a lock.
+    """
+    if limit <= 0:
+        return []
+    if not _lock_scheduler(db):
+        print("Another scheduler tick is running, skipping this one")
+        return []
+
+    now = datetime.utcnow()
+    mirrors = select(func.count(UserPermission.id)).where(
+        UserPermission.config_id == DatabaseConfig.id
+    ).correlate(DatabaseConfig).scalar_subquery()
+
+    rows = db.query(
+        DatabaseConfig, User.notion_workspace_id, mirrors
+    ).join(
+        User, DatabaseConfig.owner_user_id == User.id
+    ).filter(
+        DatabaseConfig.sync_enabled == True,
+        DatabaseConfig.next_sync_at <= now,
+        # Configs being synced right now are rescheduled when their run ends
+        lease_free_clause(now)
+    ).order_by(
+        DatabaseConfig.next_sync_at
+    ).limit(settings.sync_fair_candidates).with_for_update(
+        of=DatabaseConfig, skip_locked=True
+    ).all()
+
+    candidates = [
+        (tenant_key(config.owner_user_id, workspace_id), max(1, mirror_count), config)
+        for config, workspace_id, mirror_count in rows
+    ]
+    fair_scheduler = FairScheduler(
+        quantum=settings.sync_fair_quantum,
+        max_pending_per_tenant=settings.sync_max_pending_per_tenant,
+        deficits=_load_deficits(db),
+    )
+    configs = fair_scheduler.pick(candidates, pending, limit)
+    _save_deficits(db, fair_scheduler.deficits)
+
+    for config in configs:
+        config.next_sync_at = compute_next_sync_at(config, now)
+
+    return configs
+
+
+def start_delay() -> float:
+    """Random countdown spreading a tick's syncs over the scheduler interval"""
+    return random.uniform(0, settings.sync_scheduler_interval_seconds)
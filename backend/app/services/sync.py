@@ -1,10 +1,68 @@
-from typing import Dict, Any, List, Optional, Set
-from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Set, NamedTuple, Tuple
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.services.notion import NotionService
-from app.models import DatabaseConfig, PageMapping, SyncLog
-from app.utils.notion_helpers import build_notion_filter, filter_properties, is_property_writable
+from app.services.page_stream import SharedPageStream
+from app.services.profiling import SyncProfiler
+from app.services.scheduler import compute_next_sync_at
+from app.services.sync_events import SyncProgress
+from app.services.sync_lock import SyncLease, SyncLeaseLost, request_rerun
+from app.models import DatabaseConfig, PageMapping, SyncLog, SyncProfile
+from app.utils.notion_helpers import (
+    build_last_edited_filter,
+    build_notion_filter,
+    combine_notion_filters,
+    filter_properties,
+    hash_properties,
+    is_property_writable,
+    parse_notion_timestamp,
+)
+from app.utils.metrics import SYNC_DB_SECONDS, SYNC_ROWS, SYNC_SECONDS, start_db_timer
+from app.utils.row_filters import UnsupportedFilterError, compile_row_filters
+from app.utils.timing import PhaseTimings
 import asyncio
+import json
+import time
+import uuid
+
+
+# SYNC_ROWS outcome label of each successful write action
+WRITE_OUTCOMES = {"create": "created", "update": "updated", "archive": "archived"}
+
+
+class WriteResult(NamedTuple):
+    """Outcome of a single row write issued by the sync engine"""
+    action: str  # 'create', 'update', 'archive'
+    source_id: str
+    target_id: Optional[str]
+    error: Optional[Exception] = None
+    page: Optional[Dict[str, Any]] = None  # Page returned by the write
+
+
+class UserSyncResult(NamedTuple):
+    """Outcome of syncing one user's mirror"""
+    user_email: str
+    rows_created: int
+    rows_updated: int
+    error: Optional[Exception] = None
+
+
+class SourceQuery(NamedTuple):
+    """How a user's rows are read from the source database in one run"""
+    filter_obj: Optional[Dict[str, Any]]  # Sent to Notion
+    predicate: Optional[Callable[[Dict[str, Any]], bool]]  # Applied locally
+    full_scan: bool
+    signature: str  # Identifies the row filters the query was planned from
+    checkpoint: Optional[Dict[str, Any]] = None  # Interrupted pass being resumed
+    scan_id: Optional[str] = None  # Marks the mappings a full scan saw, see PageMapping.seen_in_scan
+
+    @property
+    def start_cursor(self) -> Optional[str]:
+        return self.checkpoint["cursor"] if self.checkpoint else None
 
 
 class NotionSyncEngine:
@@ -12,34 +70,272 @@ class NotionSyncEngine:
 
     def __init__(self, db: Session):
         self.db = db
+        # Per-run source query state, keyed by source database + filter
+        self._source_plans: Dict[int, SourceQuery] = {}
+        self._source_streams: Dict[str, SharedPageStream] = {}
+        self._opened_streams: List[SharedPageStream] = []
+        # Place reserved for each user on its query's stream, by user permission id
+        self._source_consumers: Dict[int, Tuple[SharedPageStream, int]] = {}
+        # Users doing Notion work at once, see sync_database
+        self._user_slots = asyncio.Semaphore(max(1, settings.sync_max_concurrent_users))
+        # Writable properties of source rows seen in this run, for the reverse sync
+        self._writable_props: Set[str] = set()
+        self._source_snapshot: Dict[str, Dict[str, Any]] = {}
+        self._source_snapshot_task: Optional[asyncio.Future] = None
+        self._schema_checked = False
+        # Set when another trigger arrived during the run and wants a follow-up
+        self.follow_up_requested = False
+        # Per-user phase timings of this run, keyed by user permission id
+        self._user_timings: Dict[int, PhaseTimings] = {}
+        # Live progress of this run, published to SSE streams
+        self._progress: Optional[SyncProgress] = None
+
+    async def sync_database(
+        self,
+        config_id: int,
+        sync_log_id: Optional[int] = None,
+        sync_type: str = "manual"
+    ) -> SyncLog:
+        """Main sync function - creates/updates per-user subpages and databases.
+
+        When the sync was queued, `sync_log_id` is the log created at enqueue
+        time and it is reused instead of creating a new one.
+
+        Runs hold a lease on the config. A sync started while another one is
+        running doesn't run in parallel: it is marked 'coalesced' and the
+        running sync sets `follow_up_requested` so its caller can queue a
+        single follow-up run.
+        """
+        sync_log = None
+        if sync_log_id is not None:
+            sync_log = self.db.query(SyncLog).filter(SyncLog.id == sync_log_id).first()
 
-    async def sync_database(self, config_id: int) -> SyncLog:
-        """Main sync function - creates/updates per-user subpages and databases"""
         # Load configuration
         config = self.db.query(DatabaseConfig).filter(DatabaseConfig.id == config_id).first()
+        error = None
         if not config:
-            raise ValueError(f"Configuration {config_id} not found")
-
-        if not config.owner.notion_access_token:
-            raise ValueError("User has no Notion access token")
+            error = f"Configuration {config_id} not found"
+        elif not config.owner.notion_access_token:
+            error = "User has no Notion access token"
+        if error:
+            if sync_log:
+                sync_log.status = "error"
+                sync_log.error_message = error
+                sync_log.completed_at = datetime.utcnow()
+                self.db.commit()
+            raise ValueError(error)
 
         # Create sync log
-        sync_log = SyncLog(
-            config_id=config_id,
-            sync_type="manual",
-            status="running"
-        )
-        self.db.add(sync_log)
+        if sync_log is None:
+            sync_log = SyncLog(config_id=config_id, sync_type=sync_type)
+            self.db.add(sync_log)
+
+        lease = SyncLease(config_id)
+        acquired = await asyncio.to_thread(lease.acquire)
+        if not acquired and not request_rerun(self.db, config_id):
+            # The running sync finished in between
+            acquired = await asyncio.to_thread(lease.acquire)
+        if not acquired:
+            sync_log.status = "coalesced"
+            sync_log.error_message = "Another sync of this configuration is running, a follow-up run was requested"
+            sync_log.completed_at = datetime.utcnow()
+            self.db.commit()
+            return sync_log
+
+        # Runs whose worker died still show as running, this one resumes
+        # their checkpointed progress
+        self.db.query(SyncLog).filter(
+            SyncLog.config_id == config_id,
+            SyncLog.status == "running"
+        ).update({
+            "status": "partial",
+            "error_message": "Interrupted before completing, resumed by a later sync",
+            "completed_at": datetime.utcnow(),
+        }, synchronize_session=False)
+
+        sync_log.status = "running"
         self.db.commit()
 
+        started_at = time.perf_counter()
+        db_timer = start_db_timer()
+        self._user_timings = {}
+        profiler = self._start_profiler(config)
+        self._progress = SyncProgress(config, sync_log, self._user_timings)
         try:
+            lease.start_heartbeat()
+            self._progress.start()
             notion = NotionService(config.owner.notion_access_token)
 
-            total_rows_created = 0
-            total_rows_updated = 0
+            # Plan every user's source query up front, before users start
+            # changing their checkpoints and watermarks
+            self._source_plans = {
+                user_perm.id: self._plan_source_query(user_perm)
+                for user_perm in config.user_permissions
+            }
+            self._writable_props = {
+                pm.property_name for pm in config.property_mappings
+                if pm.is_writable
+            }
+            self._source_snapshot = {}
+            self._source_snapshot_task = None
+            self._schema_checked = False
+            self._source_streams = {}
+            self._opened_streams = []
+            self._reserve_source_streams(config, notion)
+
+            # Sync users concurrently, each with its own error isolation.
+            # Users only hold a slot while they work, not while they wait
+            # for the next batch of a shared source scan, so every user of
+            # a query reads the same scan however many slots there are.
+            self._user_slots = asyncio.Semaphore(max(1, settings.sync_max_concurrent_users))
+
+            async def run_user(user_perm) -> UserSyncResult:
+                self._progress.user_started(user_perm.id)
+                try:
+                    rows_created, rows_updated = await self._sync_user(config, user_perm, notion)
+                    self._progress.user_finished(user_perm.id)
+                    return UserSyncResult(user_perm.user_email, rows_created, rows_updated)
+                except Exception as e:
+                    print(f"Failed to sync {user_perm.user_email} for config {config_id}: {e}")
+                    if not self.db.is_active:
+                        self.db.rollback()
+                    self._progress.user_finished(user_perm.id, e)
+                    return UserSyncResult(user_perm.user_email, 0, 0, e)
+                finally:
+                    # A user that failed before reading must not hold the scan back
+                    await self._release_source_stream(user_perm)
+
+            results = await asyncio.gather(*(run_user(up) for up in config.user_permissions))
+            failures = [result for result in results if result.error]
+            if results and len(failures) == len(results):
+                raise failures[0].error
+
+            # Update sync log
+            sync_log.status = "partial" if failures else "success"
+            sync_log.rows_created = sum(result.rows_created for result in results)
+            sync_log.rows_updated = sum(result.rows_updated for result in results)
+            sync_log.error_message = "\n".join(
+                [f"{result.user_email}: {result.error}" for result in failures]
+                + self._resume_notes(config)
+            ) or None
+            sync_log.completed_at = datetime.utcnow()
+
+            sync_log.timings = self._timings_summary(config, started_at, db_timer)
+
+            # Update config last sync and schedule the next one from now
+            config.last_sync_at = datetime.utcnow()
+            config.next_sync_at = compute_next_sync_at(config, config.last_sync_at)
+
+            self.db.commit()
+
+            return sync_log
+
+        except asyncio.CancelledError:
+            if not lease.lost:
+                raise
+            # The heartbeat stopped the run, record it like any other failure
+            asyncio.current_task().uncancel()
+            error = SyncLeaseLost(
+                f"Lost the sync lease of configuration {config_id}, another sync may have taken over"
+            )
+            self._record_failure(config, sync_log, error, started_at, db_timer)
+            raise error from None
+
+        except Exception as e:
+            self._record_failure(config, sync_log, e, started_at, db_timer)
+            raise
+
+        finally:
+            # Unlock the config first, whatever fails below must not leave
+            # the heartbeat renewing it
+            lease.stop_heartbeat()
+            try:
+                self.follow_up_requested = await asyncio.to_thread(lease.release)
+            except Exception as e:
+                # The lease expires on its own
+                print(f"Failed to release sync lease on config {config_id}: {e}")
+            finally:
+                for stream in self._opened_streams:
+                    stream.close()
+                SYNC_SECONDS.labels(sync_type, sync_log.status).observe(time.perf_counter() - started_at)
+                SYNC_DB_SECONDS.observe(db_timer.seconds)
+                await self._progress.finish(sync_log)
+                if profiler:
+                    self._save_profile(config, sync_log, profiler)
+
+    def _record_failure(
+        self,
+        config: DatabaseConfig,
+        sync_log: SyncLog,
+        error: Exception,
+        started_at: float,
+        db_timer
+    ):
+        """Mark a run that raised as failed, or partial when its progress was saved"""
+        if not self.db.is_active:
+            self.db.rollback()
+        # Saved progress makes the failure partial, the next sync resumes it
+        resume_notes = self._resume_notes(config)
+        sync_log.status = "partial" if resume_notes else "error"
+        sync_log.error_message = "\n".join([str(error)] + resume_notes)
+        sync_log.timings = self._timings_summary(config, started_at, db_timer)
+        sync_log.completed_at = datetime.utcnow()
+        config.next_sync_at = compute_next_sync_at(config, sync_log.completed_at)
+        self.db.commit()
+
+    def _start_profiler(self, config: DatabaseConfig) -> Optional[SyncProfiler]:
+        """Profile this run if the config asked for it once or is listed in settings"""
+        if not (config.profile_next_sync or config.id in settings.sync_profile_config_id_list):
+            return None
+        profiler = SyncProfiler(lag_interval=settings.sync_profile_lag_interval_ms / 1000)
+        if not profiler.start():
+            print(f"Not profiling config {config.id}, another profile is running in this process")
+            return None
+        return profiler
+
+    def _save_profile(self, config: DatabaseConfig, sync_log: SyncLog, profiler: SyncProfiler):
+        """Store the run's profile and keep only the latest ones of the config"""
+        profiler.stop()
+        try:
+            if not self.db.is_active:
+                self.db.rollback()
+            self.db.add(SyncProfile(
+                sync_log_id=sync_log.id,
+                config_id=config.id,
+                cpu_profile=profiler.cpu_profile(),
+                loop_lag=profiler.loop_lag(),
+                summary=profiler.summary(),
+            ))
+            config.profile_next_sync = False
+            self.db.flush()
+
+            stale = select(SyncProfile.id).where(
+                SyncProfile.config_id == config.id
+            ).order_by(SyncProfile.id.desc()).offset(max(1, settings.sync_profile_keep))
+            self.db.execute(
+                delete(SyncProfile).where(SyncProfile.id.in_(stale)),
+                execution_options={"synchronize_session": False}
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Failed to save sync profile for config {config.id}: {e}")
+
+    def _resume_notes(self, config: DatabaseConfig) -> List[str]:
+        return [
+            f"{user_perm.user_email}: progress saved, the next sync resumes from the checkpoint"
+            for user_perm in config.user_permissions
+            if user_perm.sync_checkpoint
+        ]
+
+    async def _sync_user(self, config: DatabaseConfig, user_perm, notion: NotionService) -> tuple[int, int]:
+        """Sync a single user's mirror in both directions"""
+        rows_created = 0
+        rows_updated = 0
+        timings = self._timings(user_perm)
 
-            # Sync each user permission separately
-            for user_perm in config.user_permissions:
+        with timings.phase("setup"):
+            async with self._user_slots:
                 # Ensure user has their dedicated subpage
                 if not user_perm.user_page_id:
                     await self._create_user_subpage(config, user_perm, notion)
@@ -50,42 +346,46 @@ class NotionSyncEngine:
                     await self._create_user_mirror_database(config, user_perm, notion)
                     self.db.commit()
 
-                # Sync source -> user's mirror database (with user-specific filters)
-                rows_created, rows_updated = await self._sync_source_to_user_target(
-                    config, user_perm, notion
-                )
-                total_rows_created += rows_created
-                total_rows_updated += rows_updated
+        # Sync source -> user's mirror database (with user-specific filters)
+        created, updated = await self._sync_source_to_user_target(config, user_perm, notion)
+        rows_created += created
+        rows_updated += updated
 
-                # Sync user's mirror -> source (only writable properties)
-                if user_perm.access_level == "write":
-                    rows_updated_reverse = await self._sync_user_target_to_source(
-                        config, user_perm, notion
-                    )
-                    total_rows_updated += rows_updated_reverse
+        # Sync user's mirror -> source (only writable properties)
+        if user_perm.access_level == "write":
+            with timings.phase("reverse"):
+                async with self._user_slots:
+                    rows_updated += await self._sync_user_target_to_source(config, user_perm, notion)
 
-                # Share page with user if not already shared
+        # Share page with user if not already shared
+        with timings.phase("share"):
+            async with self._user_slots:
                 await self._ensure_page_shared(user_perm, notion)
+                self.db.commit()
 
-            # Update sync log
-            sync_log.status = "success"
-            sync_log.rows_created = total_rows_created
-            sync_log.rows_updated = total_rows_updated
-            sync_log.completed_at = datetime.utcnow()
-
-            # Update config last sync
-            config.last_sync_at = datetime.utcnow()
+        return rows_created, rows_updated
 
-            self.db.commit()
+    def _count_progress(self, user_perm, **counts: int):
+        if self._progress:
+            self._progress.count(user_perm.id, **counts)
 
-            return sync_log
+    def _timings(self, user_perm) -> PhaseTimings:
+        """Phase timings of a user's mirror in this run"""
+        if user_perm.id not in self._user_timings:
+            self._user_timings[user_perm.id] = PhaseTimings()
+        return self._user_timings[user_perm.id]
 
-        except Exception as e:
-            sync_log.status = "error"
-            sync_log.error_message = str(e)
-            sync_log.completed_at = datetime.utcnow()
-            self.db.commit()
-            raise
+    def _timings_summary(self, config: DatabaseConfig, started_at: float, db_timer) -> Dict[str, Any]:
+        """Compact timing profile stored on the sync log"""
+        emails = {user_perm.id: user_perm.user_email for user_perm in config.user_permissions}
+        return {
+            "total": round(time.perf_counter() - started_at, 3),
+            "db": round(db_timer.seconds, 3),
+            "users": {
+                emails.get(user_perm_id, str(user_perm_id)): {"user_permission_id": user_perm_id, **timings.as_dict()}
+                for user_perm_id, timings in self._user_timings.items()
+            },
+        }
 
     async def _create_user_subpage(self, config: DatabaseConfig, user_perm, notion: NotionService):
         """Create dedicated subpage for a user under parent page"""
@@ -137,6 +437,27 @@ class NotionSyncEngine:
             except Exception as e:
                 print(f"Failed to share page with {user_perm.user_email}: {e}")
 
+    async def _run_writes(self, jobs: List[tuple]) -> List[WriteResult]:
+        """Run (action, source_id, target_id, call) write jobs with bounded concurrency.
+
+        Every job goes through the shared rate limiter inside NotionService, the
+        semaphore only caps how many requests are in flight at once. Failures are
+        reported per row instead of aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.sync_max_concurrent_writes))
+
+        async def run(action, source_id, target_id, call) -> WriteResult:
+            async with semaphore:
+                try:
+                    page = await call()
+                except Exception as e:
+                    return WriteResult(action, source_id, target_id, e)
+            if action == "create":
+                target_id = page["id"]
+            return WriteResult(action, source_id, target_id, page=page)
+
+        return await asyncio.gather(*(run(*job) for job in jobs))
+
     async def _sync_source_to_user_target(
         self,
         config: DatabaseConfig,
@@ -147,97 +468,441 @@ class NotionSyncEngine:
         rows_created = 0
         rows_updated = 0
 
-        # Build filter combining config-level filters AND user-specific row filters
-        user_filters = list(user_perm.row_filters) if user_perm.row_filters else []
-        notion_filter = build_notion_filter(user_filters)
+        plan = self._source_plans.get(user_perm.id) or self._plan_source_query(user_perm)
 
-        # Fetch source rows (with user-specific filters)
-        source_pages = await notion.query_database(
-            config.source_database_id,
-            filter_obj=notion_filter
+        # Get existing page mappings for this user's database
+        timings = self._timings(user_perm)
+        with timings.phase("diff"):
+            existing_mappings = self._load_user_mappings(user_perm)
+
+        matched = 0
+        newest_edit = None
+        failed = False
+        stream, consumer = self._source_consumers.pop(user_perm.id, None) or (
+            self._source_stream(notion, config.source_database_id, plan.filter_obj, plan.start_cursor), None
         )
+        fetch_started_at = stream.started_at
+        if plan.checkpoint:
+            # Pick up where the interrupted pass left off
+            matched = plan.checkpoint.get("matched", 0)
+            newest_edit = parse_notion_timestamp(plan.checkpoint["newest_edit"])
+            failed = plan.checkpoint["failed"]
+            fetch_started_at = parse_notion_timestamp(plan.checkpoint["fetch_started_at"])
+        if self._progress:
+            # Full scans should see about as many rows as the mirror holds,
+            # the size of a new mirror isn't known yet
+            expected = len(existing_mappings) if plan.full_scan else 0
+            self._progress.expect(user_perm.id, expected or None, matched)
 
-        # Get existing page mappings for this user's database
-        existing_mappings = {
-            pm.source_page_id: pm.target_page_id
-            for pm in config.page_mappings
-            if pm.target_page_id and pm.target_page_id.startswith(user_perm.target_database_id or "")
-        }
+        # Fetch source rows (with user-specific filters) and write each batch
+        # while the next one is still loading
+        batches = 0
+        try:
+            # Closing the consumer releases its place in the shared stream,
+            # even when this user fails halfway
+            async with aclosing(stream.consume(consumer)) as source_batches:
+                async for source_pages, next_cursor in timings.timed("fetch", source_batches):
+                    async with self._user_slots:
+                        (
+                            created, updated, batch_matched, batch_failed, newest_edit
+                        ) = await self._sync_source_batch(
+                            config, user_perm, notion, plan, source_pages,
+                            existing_mappings, newest_edit
+                        )
+                        rows_created += created
+                        rows_updated += updated
+                        matched += batch_matched
+                        failed = failed or batch_failed
 
-        source_page_ids = {page["id"] for page in source_pages}
+                        batches += 1
+                        if next_cursor and batches % max(1, settings.sync_checkpoint_every_batches) == 0:
+                            with timings.phase("db_flush"):
+                                self._save_checkpoint(
+                                    user_perm, plan, next_cursor, fetch_started_at,
+                                    newest_edit, matched, failed
+                                )
+        except Exception:
+            if plan.checkpoint and not batches:
+                # The saved cursor may have expired, start over next time
+                user_perm.sync_checkpoint = None
+                self.db.commit()
+            raise
 
-        for source_page in source_pages:
-            source_id = source_page["id"]
+        # Archive pages in user's database that no longer match user's filters:
+        # the mappings this scan (or the interrupted run it resumes) didn't mark
+        if plan.full_scan:
+            unseen = set(self.db.scalars(
+                select(PageMapping.source_page_id).where(
+                    PageMapping.user_permission_id == user_perm.id,
+                    or_(PageMapping.seen_in_scan.is_(None), PageMapping.seen_in_scan != plan.scan_id)
+                )
+            ))
+            jobs = [
+                ("archive", source_id, mapping.target_page_id, partial(notion.archive_page, mapping.target_page_id))
+                for source_id, mapping in existing_mappings.items()
+                if source_id in unseen
+            ]
+            with timings.phase("archive"):
+                async with self._user_slots:
+                    _, _, archive_failed = await self._apply_writes(config, user_perm, jobs, {}, existing_mappings)
+            failed = failed or archive_failed
 
-            # Filter properties based on config
-            filtered_props = filter_properties(
-                source_page["properties"],
-                config.property_mappings
-            )
+        # The pass is complete, the next run starts a new one
+        user_perm.sync_checkpoint = None
 
-            if source_id in existing_mappings:
-                # Update existing target page
-                target_id = existing_mappings[source_id]
-                try:
-                    await notion.update_page(target_id, filtered_props)
-                    rows_updated += 1
-
-                    # Update page mapping timestamp
-                    mapping = self.db.query(PageMapping).filter(
-                        PageMapping.config_id == config.id,
-                        PageMapping.source_page_id == source_id,
-                        PageMapping.target_page_id == target_id
-                    ).first()
-                    if mapping:
-                        mapping.last_synced_at = datetime.utcnow()
+        # Failed rows must be retried, so keep the old watermark in that case
+        if not failed:
+            self._advance_watermark(user_perm, newest_edit, fetch_started_at, plan.full_scan)
 
-                except Exception as e:
-                    print(f"Failed to update page {target_id}: {e}")
+        return rows_created, rows_updated
 
-                # Rate limiting
-                await asyncio.sleep(0.35)
+    async def _sync_source_batch(
+        self,
+        config: DatabaseConfig,
+        user_perm,
+        notion: NotionService,
+        plan: SourceQuery,
+        source_pages: List[Dict[str, Any]],
+        existing_mappings: Dict[str, Any],
+        newest_edit: Optional[datetime]
+    ) -> tuple[int, int, int, bool, Optional[datetime]]:
+        """Mirror one batch of source rows, returns (created, updated, matched, any_failed, newest_edit)"""
+        timings = self._timings(user_perm)
+        with timings.phase("diff"):
+            if source_pages and not self._schema_checked:
+                self._check_schema_drift(notion, config.source_database_id, source_pages[0])
+            self._remember_source_pages(source_pages)
+            fetched = len(source_pages)
+            jobs = []
+            if plan.predicate:
+                matched = []
+                for page in source_pages:
+                    if plan.predicate(page):
+                        matched.append(page)
+                    elif page["id"] in existing_mappings:
+                        # The row was edited out of the user's filters, incremental
+                        # runs must take it out of the mirror too, not only full scans
+                        target_id = existing_mappings[page["id"]].target_page_id
+                        jobs.append(("archive", page["id"], target_id, partial(notion.archive_page, target_id)))
+                SYNC_ROWS.labels("forward", "filtered").inc(fetched - len(matched))
+                source_pages = matched
 
-            else:
-                # Create new target page in user's database
-                try:
-                    new_page = await notion.create_page(
-                        user_perm.target_database_id,
-                        filtered_props
-                    )
-                    rows_created += 1
-
-                    # Create page mapping
-                    mapping = PageMapping(
-                        config_id=config.id,
-                        source_page_id=source_id,
-                        target_page_id=new_page["id"],
-                        last_synced_at=datetime.utcnow()
+            content_hashes = {}
+            skipped = 0
+            for source_page in source_pages:
+                source_id = source_page["id"]
+
+                edited_at = parse_notion_timestamp(source_page.get("last_edited_time"))
+                if edited_at and (newest_edit is None or edited_at > newest_edit):
+                    newest_edit = edited_at
+
+                # Filter properties based on config
+                filtered_props = filter_properties(
+                    source_page["properties"],
+                    config.property_mappings
+                )
+                content_hashes[source_id] = hash_properties(filtered_props)
+
+                if source_id in existing_mappings:
+                    # Skip rows whose visible properties are unchanged since the last write
+                    if existing_mappings[source_id].content_hash == content_hashes[source_id]:
+                        SYNC_ROWS.labels("forward", "skipped").inc()
+                        skipped += 1
+                        continue
+
+                    # Update existing target page
+                    target_id = existing_mappings[source_id].target_page_id
+                    jobs.append(("update", source_id, target_id, partial(notion.update_page, target_id, filtered_props)))
+                else:
+                    # Create new target page in user's database
+                    jobs.append(("create", source_id, None, partial(
+                        notion.create_page, user_perm.target_database_id, filtered_props
+                    )))
+            self._count_progress(user_perm, fetched=fetched, matched=len(source_pages), skipped=skipped)
+
+            if plan.scan_id:
+                # Mark the mapped rows this full scan saw, the ones left unmarked are archived
+                seen = [existing_mappings[page["id"]].id for page in source_pages if page["id"] in existing_mappings]
+                if seen:
+                    self.db.execute(
+                        update(PageMapping).where(PageMapping.id.in_(seen)).values(seen_in_scan=plan.scan_id),
+                        execution_options={"synchronize_session": False}
                     )
-                    self.db.add(mapping)
+                    # Another user's rollback must not lose the marks, or the
+                    # rows would be archived at the end of the scan
+                    self.db.commit()
 
-                except Exception as e:
-                    print(f"Failed to create page: {e}")
+        created, updated, batch_failed = await self._apply_writes(
+            config, user_perm, jobs, content_hashes, existing_mappings, plan.scan_id
+        )
+        return created, updated, len(source_pages), batch_failed, newest_edit
 
-                # Rate limiting
-                await asyncio.sleep(0.35)
+    def _load_user_mappings(self, user_perm) -> Dict[str, Any]:
+        """Load a user's page mappings with a single query, keyed by source page id"""
+        rows = self.db.query(
+            PageMapping.id,
+            PageMapping.source_page_id,
+            PageMapping.target_page_id,
+            PageMapping.content_hash,
+            PageMapping.mirror_hash
+        ).filter(
+            PageMapping.user_permission_id == user_perm.id
+        ).all()
+        return {row.source_page_id: row for row in rows}
 
-        # Archive pages in user's database that no longer match user's filters
-        for source_id, target_id in existing_mappings.items():
-            if source_id not in source_page_ids:
-                try:
-                    await notion.archive_page(target_id)
-                    # Remove mapping
-                    self.db.query(PageMapping).filter(
-                        PageMapping.config_id == config.id,
-                        PageMapping.source_page_id == source_id,
-                        PageMapping.target_page_id == target_id
-                    ).delete()
-                except Exception as e:
-                    print(f"Failed to archive page {target_id}: {e}")
+    async def _apply_writes(
+        self,
+        config: DatabaseConfig,
+        user_perm,
+        jobs: List[tuple],
+        content_hashes: Dict[str, str],
+        existing_mappings: Dict[str, Any],
+        scan_id: Optional[str] = None
+    ) -> tuple[int, int, bool]:
+        """Run write jobs and persist their page mappings in bulk.
 
-                await asyncio.sleep(0.35)
+        Inserts, updates and deletes are collected for the whole batch and
+        flushed as one executemany statement each. Returns
+        (rows_created, rows_updated, any_failed).
+        """
+        inserts = []
+        updates = []
+        deletes = []
+        failed = False
+        now = datetime.utcnow()
 
-        return rows_created, rows_updated
+        timings = self._timings(user_perm)
+        with timings.phase("writes"):
+            results = await self._run_writes(jobs)
+
+        failures = 0
+        for result in results:
+            if result.error:
+                failed = True
+                failures += 1
+                SYNC_ROWS.labels("forward", "failed").inc()
+                print(f"Failed to {result.action} page for source {result.source_id}: {result.error}")
+                continue
+            SYNC_ROWS.labels("forward", WRITE_OUTCOMES[result.action]).inc()
+
+            if result.action == "update":
+                updates.append({
+                    "id": existing_mappings[result.source_id].id,
+                    "last_synced_at": now,
+                    "content_hash": content_hashes[result.source_id],
+                    "mirror_hash": self._mirror_hash(result.page),
+                })
+            elif result.action == "create":
+                inserts.append({
+                    "config_id": config.id,
+                    "user_permission_id": user_perm.id,
+                    "source_page_id": result.source_id,
+                    "target_page_id": result.target_id,
+                    "last_synced_at": now,
+                    "content_hash": content_hashes[result.source_id],
+                    "mirror_hash": self._mirror_hash(result.page),
+                    "seen_in_scan": scan_id,
+                })
+            else:
+                # Archived rows leave the mirror, a full scan's final pass skips them
+                deletes.append(existing_mappings.pop(result.source_id).id)
+
+        with timings.phase("db_flush"):
+            if inserts:
+                self.db.execute(insert(PageMapping), inserts)
+            if updates:
+                self.db.execute(update(PageMapping), updates)
+            if deletes:
+                self.db.execute(
+                    delete(PageMapping).where(PageMapping.id.in_(deletes)),
+                    execution_options={"synchronize_session": False}
+                )
+            if inserts or updates or deletes:
+                # Persist each batch so a failure elsewhere can't roll it back
+                self.db.commit()
+
+        self._count_progress(user_perm, written=len(inserts) + len(updates) + len(deletes), failed=failures)
+        return len(inserts), len(updates), failed
+
+    def _plan_source_query(self, user_perm) -> SourceQuery:
+        """Work out how a user's rows are fetched from the source in this run"""
+        # Build filter combining config-level filters AND user-specific row filters
+        user_filters = list(user_perm.row_filters) if user_perm.row_filters else []
+        row_predicate = self._compile_local_filter(user_filters)
+        if row_predicate:
+            # Every user reads the same unfiltered snapshot, rows are
+            # partitioned in-process
+            notion_filter = None
+        else:
+            notion_filter = build_notion_filter(user_filters)
+
+        signature = self._filter_signature(user_filters, row_predicate is not None)
+        checkpoint = self._resumable_checkpoint(user_perm, signature)
+        if checkpoint:
+            # Resume the interrupted pass with the exact query it was running
+            return SourceQuery(
+                checkpoint["filter"], row_predicate, checkpoint["full_scan"], signature,
+                checkpoint, checkpoint.get("scan_id")
+            )
+
+        # Only full scans can detect rows that left the filter or were deleted,
+        # in between we just fetch rows edited since the last watermark
+        full_scan = self._needs_full_scan(user_perm, datetime.now(timezone.utc))
+        if not full_scan:
+            notion_filter = combine_notion_filters(
+                notion_filter,
+                build_last_edited_filter(user_perm.last_source_edited_at)
+            )
+
+        scan_id = uuid.uuid4().hex if full_scan else None
+        return SourceQuery(notion_filter, row_predicate, full_scan, signature, scan_id=scan_id)
+
+    def _filter_signature(self, row_filters: List[Any], local: bool) -> str:
+        """Fingerprint of a user's row filters, a checkpoint is only valid for the same filters"""
+        return json.dumps([local] + sorted(
+            json.dumps([rf.filter_type, rf.property_name, rf.operator, rf.value, rf.formula])
+            for rf in row_filters
+        ))
+
+    def _resumable_checkpoint(self, user_perm, signature: str) -> Optional[Dict[str, Any]]:
+        """The user's checkpoint, if the next run can still resume from it"""
+        checkpoint = user_perm.sync_checkpoint
+        if not checkpoint:
+            return None
+        saved_at = parse_notion_timestamp(checkpoint.get("saved_at"))
+        max_age = timedelta(minutes=settings.sync_checkpoint_max_age_minutes)
+        if (
+            checkpoint.get("signature") != signature
+            or not saved_at
+            or datetime.now(timezone.utc) - saved_at > max_age
+            # Full scans saved before rows were marked can't tell which ones they saw
+            or (checkpoint.get("full_scan") and not checkpoint.get("scan_id"))
+        ):
+            user_perm.sync_checkpoint = None
+            return None
+        return checkpoint
+
+    def _save_checkpoint(
+        self,
+        user_perm,
+        plan: SourceQuery,
+        cursor: str,
+        fetch_started_at: datetime,
+        newest_edit: Optional[datetime],
+        matched: int,
+        failed: bool
+    ):
+        """Record how far the source -> mirror pass got, once the batch's writes are committed.
+
+        Rows a full scan saw are marked on their mappings as it goes, so the
+        checkpoint stays the same size however far the scan got.
+        """
+        user_perm.sync_checkpoint = {
+            "signature": plan.signature,
+            "filter": plan.filter_obj,
+            "full_scan": plan.full_scan,
+            "scan_id": plan.scan_id,
+            "cursor": cursor,
+            "fetch_started_at": fetch_started_at.isoformat(),
+            "newest_edit": newest_edit.isoformat() if newest_edit else None,
+            "matched": matched,
+            "failed": failed,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.db.commit()
+
+    def _compile_local_filter(self, row_filters: List[Any]) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """Compile a user's row filters for in-process evaluation, if enabled and supported"""
+        if not settings.sync_local_filtering:
+            return None
+        try:
+            return compile_row_filters(row_filters)
+        except UnsupportedFilterError as e:
+            print(f"Falling back to Notion-side filtering: {e}")
+            return None
+
+    def _source_query_key(
+        self,
+        db_id: str,
+        filter_obj: Optional[Dict[str, Any]],
+        start_cursor: Optional[str] = None
+    ) -> str:
+        return json.dumps([db_id, filter_obj, start_cursor], sort_keys=True, default=str)
+
+    def _source_stream(
+        self,
+        notion: NotionService,
+        db_id: str,
+        filter_obj: Optional[Dict[str, Any]],
+        start_cursor: Optional[str] = None
+    ) -> SharedPageStream:
+        """Share source queries between users with the same row filters (and watermark).
+
+        They consume the same stream instead of paginating the whole source
+        again, see _reserve_source_streams. A stream that already dropped
+        batches can't be joined, a user without a reserved place then gets
+        a new one. The stream yields (batch, cursor of the next batch) pairs.
+        """
+        key = self._source_query_key(db_id, filter_obj, start_cursor)
+        stream = self._source_streams.get(key)
+        if stream is None or not stream.joinable:
+            stream = SharedPageStream(
+                notion.iter_database_pages(db_id, filter_obj=filter_obj, start_cursor=start_cursor)
+            )
+            self._source_streams[key] = stream
+            self._opened_streams.append(stream)
+        return stream
+
+    def _reserve_source_streams(self, config: DatabaseConfig, notion: NotionService):
+        """Open one stream per distinct source query and hold a place on it for each user.
+
+        Reserving before any user starts keeps every batch until all users
+        of the query read it, so the source is scanned once per query
+        whatever order the users get to it in.
+        """
+        self._source_consumers = {}
+        for user_perm in config.user_permissions:
+            plan = self._source_plans[user_perm.id]
+            stream = self._source_stream(notion, config.source_database_id, plan.filter_obj, plan.start_cursor)
+            self._source_consumers[user_perm.id] = (stream, stream.reserve())
+
+    async def _release_source_stream(self, user_perm):
+        """Drop a user's reserved place if it never started reading"""
+        reserved = self._source_consumers.pop(user_perm.id, None)
+        if reserved:
+            stream, consumer = reserved
+            await stream.release(consumer)
+
+    def _needs_full_scan(self, user_perm, now: datetime) -> bool:
+        """Whether this run must query the whole source instead of recent edits"""
+        if not user_perm.last_source_edited_at or not user_perm.last_full_sync_at:
+            return True
+        last_full = user_perm.last_full_sync_at
+        if last_full.tzinfo is None:
+            last_full = last_full.replace(tzinfo=timezone.utc)
+        return now - last_full >= timedelta(minutes=settings.sync_full_scan_interval_minutes)
+
+    def _advance_watermark(
+        self,
+        user_perm,
+        newest_edit: Optional[datetime],
+        fetch_started_at: datetime,
+        full_scan: bool
+    ):
+        """Record the newest source edit mirrored for this user"""
+        # Notion rounds last_edited_time down to the minute, so a row edited
+        # later in the minute the fetch started carries an earlier timestamp.
+        # Truncating the same way keeps it inside the next on_or_after filter.
+        fetch_minute = fetch_started_at.replace(second=0, microsecond=0)
+        if newest_edit:
+            # Rows edited while we were paginating may not be in the result,
+            # so never move the watermark past the moment the fetch started
+            user_perm.last_source_edited_at = min(newest_edit, fetch_minute)
+        elif full_scan:
+            user_perm.last_source_edited_at = fetch_minute
+
+        if full_scan:
+            user_perm.last_full_sync_at = fetch_started_at
 
     async def _sync_user_target_to_source(
         self,
@@ -249,10 +914,7 @@ class NotionSyncEngine:
         rows_updated = 0
 
         # Get writable properties
-        writable_props = {
-            pm.property_name for pm in config.property_mappings
-            if pm.is_writable
-        }
+        writable_props = self._writable_props
 
         if not writable_props:
             return 0
@@ -261,25 +923,48 @@ class NotionSyncEngine:
         target_pages = await notion.query_database(user_perm.target_database_id)
 
         # Get page mappings for this user's database (target -> source)
-        target_to_source = {
-            pm.target_page_id: pm.source_page_id
-            for pm in config.page_mappings
-            if pm.target_page_id and pm.target_page_id.startswith(user_perm.target_database_id or "")
+        mappings_by_target = {
+            mapping.target_page_id: mapping
+            for mapping in self._load_user_mappings(user_perm).values()
         }
 
+        # Only rows the user edited since the engine last wrote or saw them
+        # are pushed back. A mirror that merely differs from the source is
+        # stale (another user or the owner changed the source), and writing
+        # it back would undo that edit. Mappings without a hash yet fall
+        # back to comparing every row.
+        mirror_hashes = {}
+        edited_pages = []
         for target_page in target_pages:
-            target_id = target_page["id"]
-
-            if target_id not in target_to_source:
+            mapping = mappings_by_target.get(target_page["id"])
+            if mapping is None:
+                continue
+            mirror_hashes[mapping.id] = self._mirror_hash(target_page)
+            if mapping.mirror_hash == mirror_hashes[mapping.id]:
+                SYNC_ROWS.labels("reverse", "skipped").inc()
                 continue
+            edited_pages.append((target_page, mapping))
 
-            source_id = target_to_source[target_id]
+        # Compare against source rows already fetched in this run, reading the
+        # whole source in one paginated pass only if some are missing
+        if any(mapping.source_page_id not in self._source_snapshot for _, mapping in edited_pages):
+            await self._load_source_snapshot(notion, config.source_database_id)
+
+        jobs = []
+        pending_updates = {}
+        new_mirror_hashes = {}
+        for target_page, mapping in edited_pages:
+            target_id = target_page["id"]
+            source_id = mapping.source_page_id
 
             # Get source page current state
-            try:
-                source_page = await notion.get_page(source_id)
-            except Exception as e:
-                print(f"Failed to get source page {source_id}: {e}")
+            source_properties = self._source_snapshot.get(source_id)
+            if source_properties is None:
+                SYNC_ROWS.labels("reverse", "missing").inc()
+                print(f"Source page {source_id} not found in source database")
+                # Nothing to push to, don't read the whole source again for
+                # it every run until a full scan archives the mirror row
+                new_mirror_hashes[mapping.id] = mirror_hashes[mapping.id]
                 continue
 
             # Build update with only writable properties that changed
@@ -287,19 +972,78 @@ class NotionSyncEngine:
             for prop_name in writable_props:
                 if prop_name in target_page["properties"]:
                     target_value = target_page["properties"][prop_name]
-                    source_value = source_page["properties"].get(prop_name)
+                    source_value = source_properties.get(prop_name)
 
                     # Simple comparison (can be enhanced)
                     if target_value != source_value:
                         updates[prop_name] = target_value
 
             if updates:
-                try:
-                    await notion.update_page(source_id, updates)
-                    rows_updated += 1
-                except Exception as e:
-                    print(f"Failed to update source page {source_id}: {e}")
+                jobs.append(("update", source_id, target_id, partial(notion.update_page, source_id, updates)))
+                pending_updates[target_id] = updates
+            else:
+                SYNC_ROWS.labels("reverse", "skipped").inc()
+                new_mirror_hashes[mapping.id] = mirror_hashes[mapping.id]
 
-                await asyncio.sleep(0.35)
+        mapping_ids = {mapping.target_page_id: mapping.id for _, mapping in edited_pages}
+        for result in await self._run_writes(jobs):
+            if result.error:
+                SYNC_ROWS.labels("reverse", "failed").inc()
+                print(f"Failed to update source page {result.source_id}: {result.error}")
+            else:
+                SYNC_ROWS.labels("reverse", "updated").inc()
+                rows_updated += 1
+                # Keep the snapshot current for other users of this run, only
+                # once the source really holds the new values
+                self._source_snapshot[result.source_id].update(pending_updates[result.target_id])
+                new_mirror_hashes[mapping_ids[result.target_id]] = mirror_hashes[mapping_ids[result.target_id]]
+
+        # Failed rows keep their old hash so the next run retries them
+        if new_mirror_hashes:
+            self.db.execute(update(PageMapping), [
+                {"id": mapping_id, "mirror_hash": mirror_hash} for mapping_id, mirror_hash in new_mirror_hashes.items()
+            ])
+            self.db.commit()
 
         return rows_updated
+
+    def _mirror_hash(self, page: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Hash of a mirror page's writable properties, None without writable properties"""
+        if not page or not self._writable_props:
+            return None
+        return hash_properties({
+            name: value for name, value in page.get("properties", {}).items()
+            if name in self._writable_props
+        })
+
+    def _check_schema_drift(self, notion: NotionService, db_id: str, source_page: Dict[str, Any]):
+        """Drop the cached source schema if fetched rows no longer match it"""
+        self._schema_checked = True
+        schema = notion.cached_database_schema(db_id)
+        if schema is None:
+            return
+        schema_props = {prop["name"]: prop["type"] for prop in schema["properties"]}
+        page_props = {name: prop.get("type") for name, prop in source_page["properties"].items()}
+        if schema_props != page_props:
+            print(f"Schema of source database {db_id} changed, invalidating cached schema")
+            notion.invalidate_database_schema(db_id)
+
+    def _remember_source_pages(self, source_pages: List[Dict[str, Any]]):
+        """Keep the writable properties of fetched source rows for the reverse sync"""
+        if not self._writable_props:
+            return
+        for page in source_pages:
+            self._source_snapshot[page["id"]] = {
+                name: value for name, value in page["properties"].items()
+                if name in self._writable_props
+            }
+
+    async def _load_source_snapshot(self, notion: NotionService, db_id: str):
+        """Read the whole source database once per run into the snapshot"""
+        if self._source_snapshot_task is None:
+            async def load():
+                async for batch in notion.iter_database(db_id):
+                    self._remember_source_pages(batch)
+
+            self._source_snapshot_task = asyncio.ensure_future(load())
+        await self._source_snapshot_task
@@ -0,0 +1,267 @@
+from typing import Any, Dict, Optional, Set, Tuple
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.database import engine
+from app.utils.timing import PhaseTimings
+import asyncio
+import json
+import select
+import threading
+import time
+
+# Postgres channel workers publish sync events on
+CHANNEL = "sync_progress"
+# NOTIFY rejects payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+# Events buffered per SSE stream before the oldest are dropped
+SUBSCRIBER_BUFFER = 16
+
+
+def _uses_notify() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def _offer(queue: asyncio.Queue, event: Dict[str, Any]):
+    # Events are full snapshots, a slow reader only misses intermediate ones
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class ProgressBroker:
+    """Fans sync events out to the SSE streams open in this process"""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(self, config_id: int):
+        """Queue receiving the events of a config while the block runs"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SUBSCRIBER_BUFFER))
+        with self._lock:
+            self._subscribers.setdefault(config_id, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(config_id, set())
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(config_id, None)
+
+    def dispatch(self, event: Dict[str, Any]):
+        """Deliver an event to its config's subscribers, callable from any thread"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.get("config_id"), ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # The stream's loop is closed, it unsubscribes on its own
+                pass
+
+
+broker = ProgressBroker()
+
+
+def publish(event: Dict[str, Any]):
+    """Send a sync event to every API process.
+
+    On Postgres it goes through NOTIFY, so events from Celery workers reach
+    the listener of each API process. Elsewhere only this process's
+    subscribers get it.
+    """
+    if not _uses_notify():
+        broker.dispatch(event)
+        return
+
+    payload = json.dumps(event, default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        # Too many users for one notification, send the totals only
+        payload = json.dumps({**event, "users": None}, default=str)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+        conn.commit()
+
+
+class ProgressListener:
+    """Relays NOTIFY sync events to the broker from a background thread.
+
+    One LISTEN connection per API process, however many streams are open,
+    so dashboards don't cost a query per update.
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if not _uses_notify() or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sync-progress-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                print(f"Sync progress listener failed, reconnecting: {e}")
+                self._stop.wait(5)
+
+    def _listen(self):
+        import psycopg2
+
+        url = make_url(settings.database_url).set(drivername="postgresql")
+        conn = psycopg2.connect(url.render_as_string(hide_password=False))
+        try:
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {CHANNEL}")
+            while not self._stop.is_set():
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    broker.dispatch(json.loads(notify.payload))
+        finally:
+            conn.close()
+
+
+progress_listener = ProgressListener()
+
+
+class SyncProgress:
+    """Live progress of one sync run, published while it runs.
+
+    The engine bumps the per-user counters and the current phase is read
+    from each user's PhaseTimings. A snapshot goes out every
+    SYNC_PROGRESS_INTERVAL_SECONDS when something changed. The ETA is only
+    known for full scans, estimated from the mirror's size at the start.
+    """
+
+    def __init__(self, config, sync_log, timings: Dict[int, PhaseTimings]):
+        self.config_id = config.id
+        self.sync_log_id = sync_log.id
+        self.sync_type = sync_log.sync_type
+        self._timings = timings
+        self._emails = {user_perm.id: user_perm.user_email for user_perm in config.user_permissions}
+        self._users: Dict[int, Dict[str, Any]] = {
+            user_perm_id: {
+                "state": "pending",
+                "fetched": 0,
+                "matched": 0,
+                "written": 0,
+                "skipped": 0,
+                "failed": 0,
+                "expected": None,
+            }
+            for user_perm_id in self._emails
+        }
+        # (monotonic time, matched rows) when each user's full scan started
+        self._scan_started: Dict[int, Tuple[float, int]] = {}
+        self._started_at = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._last_published: Optional[Dict[str, Any]] = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._publish_forever())
+
+    def user_started(self, user_perm_id: int):
+        self._users[user_perm_id]["state"] = "running"
+
+    def user_finished(self, user_perm_id: int, error: Optional[Exception] = None):
+        self._users[user_perm_id]["state"] = "error" if error else "done"
+
+    def expect(self, user_perm_id: int, expected: Optional[int], matched: int = 0):
+        """Start tracking a user's pass, `expected` rows when it's a full scan"""
+        user = self._users[user_perm_id]
+        user["expected"] = expected
+        user["matched"] = matched
+        self._scan_started[user_perm_id] = (time.monotonic(), matched)
+
+    def count(self, user_perm_id: int, **counts: int):
+        user = self._users[user_perm_id]
+        for name, value in counts.items():
+            user[name] += value
+
+    def _user_eta(self, user_perm_id: int) -> Optional[float]:
+        user = self._users[user_perm_id]
+        if user["state"] in ("done", "error"):
+            return 0.0
+        if user["expected"] is None or user_perm_id not in self._scan_started:
+            return None
+        started_at, matched_at_start = self._scan_started[user_perm_id]
+        done = user["matched"] - matched_at_start
+        remaining = user["expected"] - user["matched"]
+        if remaining <= 0:
+            return 0.0
+        if done <= 0:
+            return None
+        return round((time.monotonic() - started_at) / done * remaining, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        users = {}
+        for user_perm_id, user in self._users.items():
+            timings = self._timings.get(user_perm_id)
+            users[self._emails[user_perm_id]] = {
+                **user,
+                "phase": timings.current if timings else None,
+                "eta_seconds": self._user_eta(user_perm_id),
+            }
+        etas = [user["eta_seconds"] for user in users.values()]
+        return {
+            "type": "progress",
+            "config_id": self.config_id,
+            "sync_log_id": self.sync_log_id,
+            "sync_type": self.sync_type,
+            "elapsed_seconds": round(time.monotonic() - self._started_at, 1),
+            "eta_seconds": None if None in etas else max(etas, default=0.0),
+            "totals": {
+                name: sum(user[name] for user in self._users.values())
+                for name in ("fetched", "written", "skipped", "failed")
+            },
+            "users": users,
+        }
+
+    def _publish(self, event: Dict[str, Any]):
+        try:
+            publish(event)
+        except Exception as e:
+            # Progress is best effort, it must never fail the sync
+            print(f"Failed to publish sync progress for config {self.config_id}: {e}")
+
+    async def _publish_forever(self):
+        interval = max(0.1, settings.sync_progress_interval_seconds)
+        while True:
+            event = self.snapshot()
+            changed = {key: event[key] for key in ("totals", "users")}
+            if changed != self._last_published:
+                self._last_published = changed
+                # NOTIFY is a blocking query, keep it off the event loop
+                await asyncio.to_thread(self._publish, event)
+            await asyncio.sleep(interval)
+
+    async def finish(self, sync_log):
+        """Stop the updates and announce how the run ended"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        event = self.snapshot()
+        event.update(
+            type="finished",
+            eta_seconds=0.0,
+            status=sync_log.status,
+            rows_created=sync_log.rows_created,
+            rows_updated=sync_log.rows_updated,
+            error_message=sync_log.error_message,
+        )
+        await asyncio.to_thread(self._publish, event)
@@ -0,0 +1,143 @@
+from typing import Optional
+from datetime import datetime, timedelta
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import DatabaseConfig, SyncLog
+import asyncio
+import os
+import socket
+import uuid
+
+
+def lease_free_clause(now: datetime):
+    """SQL condition matching configs no live sync holds a lease on"""
+    return or_(
+        DatabaseConfig.sync_lease_expires_at.is_(None),
+        DatabaseConfig.sync_lease_expires_at < now
+    )
+
+
+class SyncLeaseLost(Exception):
+    """Raised when a sync's lease was taken over while it was still running"""
+
+
+class SyncLease:
+    """Lease on a config's sync, stored on the database_configs row.
+
+    Acquiring is a single conditional UPDATE, so only one worker wins even
+    when several start at once. The holder renews the lease while it runs;
+    if it dies the lease expires and the next sync can take over.
+
+    Lease writes use their own session so heartbeats never commit the sync
+    engine's half-finished work. A holder that loses the lease is cancelled,
+    another worker may be syncing the config by then.
+    """
+
+    def __init__(self, config_id: int):
+        self.config_id = config_id
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lost = False
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._holder: Optional[asyncio.Task] = None
+
+    def _update(self, *conditions, **values) -> int:
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(DatabaseConfig)
+                .where(DatabaseConfig.id == self.config_id, *conditions)
+                .values(**values)
+            )
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    def acquire(self) -> bool:
+        now = datetime.utcnow()
+        return self._update(
+            lease_free_clause(now),
+            sync_lease_owner=self.owner,
+            sync_lease_expires_at=now + timedelta(seconds=settings.sync_lease_seconds),
+            sync_rerun_requested=False,
+        ) == 1
+
+    def renew(self) -> bool:
+        """Extend the lease, False when it was lost to another worker"""
+        return self._update(
+            DatabaseConfig.sync_lease_owner == self.owner,
+            sync_lease_expires_at=datetime.utcnow() + timedelta(seconds=settings.sync_lease_seconds),
+        ) == 1
+
+    def release(self) -> bool:
+        """Give the lease back, returns whether a follow-up run was requested"""
+        self.stop_heartbeat()
+        db = SessionLocal()
+        try:
+            config = db.query(DatabaseConfig).filter(
+                DatabaseConfig.id == self.config_id,
+                DatabaseConfig.sync_lease_owner == self.owner
+            ).with_for_update().first()
+            if not config:
+                return False
+            rerun = bool(config.sync_rerun_requested)
+            config.sync_lease_owner = None
+            config.sync_lease_expires_at = None
+            config.sync_rerun_requested = False
+            db.commit()
+            return rerun
+        finally:
+            db.close()
+
+    async def _renew_forever(self):
+        interval = max(1.0, settings.sync_lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Off the event loop, other syncs sharing it keep running
+                if not await asyncio.to_thread(self.renew):
+                    print(f"Lost sync lease on config {self.config_id}, stopping the sync")
+                    self.lost = True
+                    # Carrying on would write rows the new holder writes too
+                    if self._holder:
+                        self._holder.cancel()
+                    return
+            except Exception as e:
+                print(f"Failed to renew sync lease on config {self.config_id}: {e}")
+
+    def start_heartbeat(self):
+        """Renew the lease while the calling task runs, cancelling the task if it's lost"""
+        self._holder = asyncio.current_task()
+        self._heartbeat = asyncio.ensure_future(self._renew_forever())
+
+    def stop_heartbeat(self):
+        if self._heartbeat and not self._heartbeat.done():
+            self._heartbeat.cancel()
+        self._heartbeat = None
+        self._holder = None
+
+
+def request_rerun(db: Session, config_id: int) -> bool:
+    """Ask the running sync for one follow-up run, False if none is running"""
+    result = db.execute(
+        update(DatabaseConfig)
+        .where(
+            DatabaseConfig.id == config_id,
+            DatabaseConfig.sync_lease_expires_at >= datetime.utcnow()
+        )
+        .values(sync_rerun_requested=True)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def get_pending_sync_log(db: Session, config_id: int) -> Optional[SyncLog]:
+    """Latest queued or running sync of a config, ignoring abandoned logs"""
+    stale_before = datetime.utcnow() - timedelta(minutes=settings.sync_queue_stale_minutes)
+    return db.query(SyncLog).filter(
+        SyncLog.config_id == config_id,
+        SyncLog.status.in_(("queued", "running")),
+        SyncLog.started_at >= stale_before
+    ).order_by(SyncLog.started_at.desc()).first()
@@ -1,6 +1,8 @@
 from celery import Celery
-from celery.schedules import crontab
+from celery.signals import worker_init
+from kombu import Queue
 from app.config import settings
+from app.utils.metrics import start_metrics_server
 
 # Use PostgreSQL as broker and backend
 broker_url = settings.database_url.replace("postgresql://", "db+postgresql://")
@@ -12,6 +14,17 @@ celery_app = Celery(
     include=["app.tasks.sync_tasks"]
 )
 
+# Lanes: manual triggers and scheduled runs go to separate queues. The
+# database broker round-robins between the queues a worker consumes and
+# has no priorities, so manual syncs only skip the scheduled backlog when
+# a worker pool of their own consumes sync_manual (-Q sync_manual). A
+# worker started without -Q consumes both, which is fine in development.
+MANUAL_SYNC_QUEUE = "sync_manual"
+SCHEDULED_SYNC_QUEUE = "sync_scheduled"
+# Scheduler ticks are short and must not wait behind long scheduled syncs,
+# the manual pool consumes them too (-Q sync_manual,sync_scheduler)
+SCHEDULER_QUEUE = "sync_scheduler"
+
 # Celery configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -19,12 +32,24 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_queues=(Queue(MANUAL_SYNC_QUEUE), Queue(SCHEDULED_SYNC_QUEUE), Queue(SCHEDULER_QUEUE)),
+    task_default_queue=SCHEDULED_SYNC_QUEUE,
+    task_routes={"app.tasks.sync_tasks.schedule_due_syncs": {"queue": SCHEDULER_QUEUE}},
+    # Reserve one task at a time so syncs don't wait behind a busy worker's
+    # prefetched tasks while another worker is idle
+    worker_prefetch_multiplier=1,
 )
 
 # Celery Beat schedule
 celery_app.conf.beat_schedule = {
-    "sync-all-enabled-configs": {
-        "task": "app.tasks.sync_tasks.sync_all_enabled",
-        "schedule": crontab(minute="*/5"),  # Every 5 minutes
+    "schedule-due-syncs": {
+        "task": "app.tasks.sync_tasks.schedule_due_syncs",
+        "schedule": settings.sync_scheduler_interval_seconds,  # Only due configs get queued
     },
 }
+
+
+@worker_init.connect
+def _start_metrics_server(**kwargs):
+    if settings.metrics_worker_port:
+        start_metrics_server(settings.metrics_worker_port)
@@ -1,39 +1,103 @@
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, MANUAL_SYNC_QUEUE, SCHEDULED_SYNC_QUEUE
+from app.config import settings
 from app.database import SessionLocal
-from app.models import DatabaseConfig
+from app.models import SyncLog
+from app.services.notion_clients import close_notion_clients
+from app.services.scheduler import claim_due_configs, get_pending_by_tenant, start_delay
 from app.services.sync import NotionSyncEngine
+from app.tasks.worker_loop import worker_loop
+from datetime import datetime
+from typing import Optional
 import asyncio
 
 
+async def _run_sync(engine: NotionSyncEngine, config_id: int, sync_log_id: Optional[int], sync_type: str):
+    try:
+        await engine.sync_database(config_id, sync_log_id=sync_log_id, sync_type=sync_type)
+    finally:
+        # Pooled connections can't outlive the loop asyncio.run() tears down
+        await close_notion_clients()
+
+
+def _execute_sync(engine: NotionSyncEngine, config_id: int, sync_log_id: Optional[int], sync_type: str):
+    if settings.sync_worker_shared_loop:
+        # Connections stay pooled on the long-lived loop between tasks
+        worker_loop.run(engine.sync_database(config_id, sync_log_id=sync_log_id, sync_type=sync_type))
+    else:
+        asyncio.run(_run_sync(engine, config_id, sync_log_id, sync_type))
+
+
+def _queue_follow_up(db, config_id: int):
+    """Queue the single run that coalesces triggers received during a sync"""
+    sync_log = SyncLog(config_id=config_id, sync_type="follow_up", status="queued")
+    db.add(sync_log)
+    db.commit()
+    try:
+        # Follow-ups carry triggers that were waiting already
+        sync_database.apply_async(args=(config_id, sync_log.id, "follow_up"), queue=MANUAL_SYNC_QUEUE)
+    except Exception as e:
+        sync_log.status = "error"
+        sync_log.error_message = f"Failed to queue sync: {e}"
+        sync_log.completed_at = datetime.utcnow()
+        db.commit()
+
+
 @celery_app.task(name="app.tasks.sync_tasks.sync_database")
-def sync_database(config_id: int):
+def sync_database(config_id: int, sync_log_id: Optional[int] = None, sync_type: str = "scheduled"):
     """Sync a specific database configuration"""
     db = SessionLocal()
+    engine = NotionSyncEngine(db)
     try:
-        engine = NotionSyncEngine(db)
-        asyncio.run(engine.sync_database(config_id))
+        _execute_sync(engine, config_id, sync_log_id, sync_type)
     except Exception as e:
         print(f"Error syncing config {config_id}: {e}")
     finally:
-        db.close()
+        try:
+            if engine.follow_up_requested:
+                _queue_follow_up(db, config_id)
+        finally:
+            db.close()
 
 
-@celery_app.task(name="app.tasks.sync_tasks.sync_all_enabled")
-def sync_all_enabled():
-    """Sync all enabled configurations"""
+@celery_app.task(name="app.tasks.sync_tasks.schedule_due_syncs")
+def schedule_due_syncs():
+    """Queue the enabled configurations whose next sync is due"""
     db = SessionLocal()
     try:
-        configs = db.query(DatabaseConfig).filter(
-            DatabaseConfig.sync_enabled == True
-        ).all()
+        # Backpressure: leave due configs for a later tick while the queue is deep
+        pending = get_pending_by_tenant(db)
+        depth = sum(pending.values())
+        configs = claim_due_configs(db, settings.sync_max_queued - depth, pending)
+        if not configs:
+            db.commit()
+            if depth >= settings.sync_max_queued:
+                print(f"Sync queue is full ({depth} pending), skipping this tick")
+            return
 
+        sync_logs = []
         for config in configs:
-            # Queue individual sync tasks
-            sync_database.delay(config.id)
+            sync_log = SyncLog(config_id=config.id, sync_type="scheduled", status="queued")
+            db.add(sync_log)
+            sync_logs.append(sync_log)
+        db.commit()
+
+        for config, sync_log in zip(configs, sync_logs):
+            try:
+                sync_database.apply_async(
+                    args=(config.id, sync_log.id, "scheduled"),
+                    countdown=start_delay(),
+                    queue=SCHEDULED_SYNC_QUEUE
+                )
+            except Exception as e:
+                sync_log.status = "error"
+                sync_log.error_message = f"Failed to queue sync: {e}"
+                sync_log.completed_at = datetime.utcnow()
+        db.commit()
 
-        print(f"Queued {len(configs)} sync tasks")
+        print(f"Queued {len(configs)} sync tasks ({depth} already pending)")
 
     except Exception as e:
+        db.rollback()
         print(f"Error queuing sync tasks: {e}")
     finally:
         db.close()
@@ -0,0 +1,90 @@
+from typing import Any, Awaitable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from celery.signals import worker_process_shutdown, worker_shutdown
+from app.config import settings
+from app.services.notion_clients import close_notion_clients
+import asyncio
+import os
+import threading
+
+
+class WorkerLoop:
+    """Event loop that lives as long as the worker process, in its own thread.
+
+    Tasks submit their coroutine and block until it finishes, so with a
+    threads pool (`celery worker -P threads -c N`) one process runs N syncs
+    concurrently on a single loop while pooled Notion connections stay
+    warm between tasks. The loop starts lazily, after a prefork child was
+    forked, and is restarted if the process was forked since.
+
+    Anything blocking on the loop stalls every sync of the process. Lease
+    heartbeats and progress events run in the loop's executor, sized by
+    SYNC_WORKER_IO_THREADS. The sync engine's own queries stay on the loop:
+    the users of a run share one Session, which isn't thread-safe. They are
+    short batched statements, but a slow database still delays all N
+    syncs, so keep N modest and the connection pool at least N plus the
+    executor's threads.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _ensure_running(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop and self._pid == os.getpid() and self._thread.is_alive():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(ThreadPoolExecutor(
+                max_workers=max(1, settings.sync_worker_io_threads),
+                thread_name_prefix="sync-io",
+            ))
+            started = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name="sync-event-loop", daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return loop
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the shared loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_running()).result()
+
+    def stop(self, timeout: float = 10.0):
+        """Close pooled clients and stop the loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if not loop or self._pid != os.getpid() or not thread.is_alive():
+                return
+            self._loop = self._thread = self._pid = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_notion_clients(), loop).result(timeout)
+        except Exception as e:
+            print(f"Error closing Notion clients: {e}")
+        try:
+            asyncio.run_coroutine_threadsafe(loop.shutdown_default_executor(), loop).result(timeout)
+        except Exception as e:
+            print(f"Error stopping sync I/O threads: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+
+
+worker_loop = WorkerLoop()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_loop(**kwargs):
+    worker_loop.stop()
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import copy
+import threading
+import time
+
+_MISSING = object()
+
+
+class AsyncTTLCache:
+    """In-process LRU cache with per-entry TTLs and single-flight loading.
+
+    Concurrent misses for the same key on one event loop share a single
+    loader call. Values are deep-copied on the way out so callers can't
+    mutate what other callers will read.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value without loading it"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Return the cached value, calling `loader` once on a miss"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Futures are bound to their loop, so only share loads within one
+        inflight_key = (id(asyncio.get_running_loop()), key)
+        future = self._inflight.get(inflight_key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._inflight[inflight_key] = future
+            try:
+                value = await future
+            finally:
+                self._inflight.pop(inflight_key, None)
+            self.set(key, value, ttl)
+        else:
+            value = await asyncio.shield(future)
+        return copy.deepcopy(value)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches `predicate`"""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
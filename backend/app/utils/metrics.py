@@ -0,0 +1,115 @@
+from typing import Optional
+from contextvars import ContextVar
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import os
+import time
+
+# Notion API
+NOTION_REQUESTS = Counter(
+    "notionshare_notion_requests_total",
+    "Notion API calls by endpoint and HTTP status ('error' when no response came back)",
+    ["endpoint", "status"],
+)
+NOTION_REQUEST_SECONDS = Histogram(
+    "notionshare_notion_request_seconds",
+    "Notion API call latency, per attempt",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+NOTION_RATE_LIMITED = Counter(
+    "notionshare_notion_rate_limited_total",
+    "Notion API calls rejected with 429",
+    ["endpoint"],
+)
+NOTION_RATE_LIMIT_WAIT_SECONDS = Counter(
+    "notionshare_notion_rate_limit_wait_seconds_total",
+    "Time spent waiting on the client-side rate limiter",
+    ["endpoint"],
+)
+
+# Sync engine
+SYNC_ROWS = Counter(
+    "notionshare_sync_rows_total",
+    "Rows handled by the sync engine per phase ('forward', 'reverse') and outcome",
+    ["phase", "outcome"],
+)
+SYNC_SECONDS = Histogram(
+    "notionshare_sync_seconds",
+    "Wall time of a config sync",
+    ["sync_type", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+SYNC_DB_SECONDS = Histogram(
+    "notionshare_sync_db_seconds",
+    "Time a config sync spent executing database statements",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60),
+)
+
+
+class DBTimer:
+    """Accumulates statement time of the sync running in the current context"""
+
+    def __init__(self):
+        self.seconds = 0.0
+
+
+# Child tasks of a sync copy the context, so they add to the same timer
+_db_timer: ContextVar[Optional[DBTimer]] = ContextVar("db_timer", default=None)
+
+
+def start_db_timer() -> DBTimer:
+    timer = DBTimer()
+    _db_timer.set(timer)
+    return timer
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement run on `engine` against the current sync's DBTimer"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["query_started_at"].pop()
+        timer = _db_timer.get()
+        if timer is not None:
+            timer.seconds += time.perf_counter() - started_at
+
+
+def _registry() -> Optional[CollectorRegistry]:
+    """Aggregate all processes' metrics when running in prometheus multiprocess mode"""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return None
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Metrics in the Prometheus text format, with their content type"""
+    registry = _registry()
+    if registry is None:
+        return generate_latest(), CONTENT_TYPE_LATEST
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    """Serve /metrics from a background thread (used by Celery workers)"""
+    registry = _registry()
+    if registry is None:
+        start_http_server(port)
+    else:
+        start_http_server(port, registry=registry)
@@ -1,4 +1,7 @@
 from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+import hashlib
+import json
 
 
 def extract_title_from_database(database: Dict[str, Any]) -> str:
@@ -50,6 +53,37 @@ def build_notion_filter(row_filters: List[Any]) -> Optional[Dict[str, Any]]:
     }
 
 
+def build_last_edited_filter(since: datetime) -> Dict[str, Any]:
+    """Build a Notion timestamp filter matching pages edited on or after `since`"""
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {"on_or_after": since.isoformat()}
+    }
+
+
+def combine_notion_filters(*filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """AND together Notion filter objects, ignoring empty ones"""
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+
+    if len(filters) == 1:
+        return filters[0]
+
+    return {
+        "and": filters
+    }
+
+
+def parse_notion_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp returned by the Notion API"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def filter_properties(
     properties: Dict[str, Any],
     property_mappings: List[Any]
@@ -70,6 +104,18 @@ def filter_properties(
     }
 
 
+def hash_properties(properties: Dict[str, Any]) -> str:
+    """Stable hash of a page property payload, used to skip no-op updates"""
+    # Property ids are metadata, only names, types and values matter
+    normalized = {
+        prop_name: {k: v for k, v in prop_value.items() if k != "id"}
+        if isinstance(prop_value, dict) else prop_value
+        for prop_name, prop_value in properties.items()
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 def is_property_writable(property_name: str, property_mappings: List[Any]) -> bool:
     """Check if a property is writable based on PropertyMapping configuration"""
     for pm in property_mappings:
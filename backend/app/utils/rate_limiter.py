@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from app.config import settings
+from app.utils.security import token_fingerprint
+
+
+class TokenBucket:
+    """Token bucket shared by every caller using the same Notion credentials.
+
+    Tokens are reserved synchronously under a thread lock and the caller then
+    sleeps for its share of the deficit, so the bucket is safe to share across
+    threads and event loops (Celery creates a new loop per task).
+
+    The refill rate adapts to throttling: a 429 halves it and pauses the
+    bucket for the Retry-After period, successful calls then raise it back
+    step by step to the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # No tokens accrue while the bucket is paused by a Retry-After
+        elapsed = now - max(self._updated_at, self._blocked_until)
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = max(self._updated_at, now)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            paused = max(0.0, self._blocked_until - now)
+            if self._tokens >= 0:
+                return paused
+            return paused + -self._tokens / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until the requested tokens are available, returns time waited"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after the API reported a rate limit"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Concurrent requests failing together only count as one signal
+            if now >= self._blocked_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def recover(self) -> None:
+        """Additively restore the rate after a successful call"""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(access_token: str) -> TokenBucket:
+    """Return the process-wide token bucket for a Notion access token"""
+    key = token_fingerprint(access_token)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=settings.notion_rate_limit_per_second,
+                capacity=settings.notion_rate_limit_burst,
+            )
+            _buckets[key] = bucket
+        return bucket
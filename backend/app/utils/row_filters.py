@@ -0,0 +1,298 @@
+import ast
+import operator
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class UnsupportedFilterError(ValueError):
+    """Raised when a RowFilter cannot be evaluated locally"""
+
+
+def get_property_value(prop: Optional[Dict[str, Any]]) -> Any:
+    """Extract a plain Python value from a Notion page property object"""
+    if not prop:
+        return None
+
+    prop_type = prop.get("type")
+    value = prop.get(prop_type)
+
+    if prop_type in ("title", "rich_text"):
+        return "".join(item.get("plain_text", "") for item in value or [])
+    if prop_type in ("select", "status"):
+        return value.get("name") if value else None
+    if prop_type == "multi_select":
+        return [option.get("name") for option in value or []]
+    if prop_type == "date":
+        return value.get("start") if value else None
+    if prop_type == "people":
+        return [person.get("name") or person.get("id") for person in value or []]
+    if prop_type == "relation":
+        return [related.get("id") for related in value or []]
+    if prop_type == "files":
+        return [f.get("name") for f in value or []]
+    if prop_type in ("created_by", "last_edited_by"):
+        return value.get("name") or value.get("id") if value else None
+    if prop_type == "unique_id":
+        return value.get("number") if value else None
+    if prop_type in ("formula", "rollup"):
+        if not value:
+            return None
+        inner_type = value.get("type")
+        inner = value.get(inner_type)
+        if inner_type == "date":
+            return inner.get("start") if inner else None
+        if inner_type == "array":
+            return [get_property_value(item) for item in inner or []]
+        return inner
+
+    # number, checkbox, url, email, phone_number, created_time, last_edited_time
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "checked")
+    return bool(value)
+
+
+def _to_date(value: Any) -> Optional[Any]:
+    """Parse ISO dates, keeping date-only values as dates like Notion does"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (date, datetime)):
+        return value
+    text = str(value).replace("Z", "+00:00")
+    try:
+        if len(text) <= 10:
+            return date.fromisoformat(text)
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def _compare_dates(left: Any, right: Any, op: Callable[[Any, Any], bool]) -> bool:
+    left, right = _to_date(left), _to_date(right)
+    if left is None or right is None:
+        return False
+    # Compare at day granularity when either side has no time component
+    if not isinstance(left, datetime) or not isinstance(right, datetime):
+        left = left.date() if isinstance(left, datetime) else left
+        right = right.date() if isinstance(right, datetime) else right
+    elif (left.tzinfo is None) != (right.tzinfo is None):
+        left, right = left.replace(tzinfo=None), right.replace(tzinfo=None)
+    return op(left, right)
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value).lower()
+
+
+def _equals(actual: Any, expected: Optional[str], prop_type: Optional[str]) -> bool:
+    if prop_type == "checkbox" or isinstance(actual, bool):
+        return _to_bool(actual) == _to_bool(expected)
+    if isinstance(actual, (int, float)):
+        return actual == _to_number(expected)
+    if prop_type in ("date", "created_time", "last_edited_time"):
+        return _compare_dates(actual, expected, operator.eq)
+    if isinstance(actual, list):
+        return expected in actual
+    return actual == expected
+
+
+def _contains(actual: Any, expected: Optional[str]) -> bool:
+    if isinstance(actual, list):
+        return expected in actual
+    return _text(expected) in _text(actual)
+
+
+def _number_op(op: Callable[[float, float], bool]):
+    def check(actual: Any, expected: Optional[str], prop_type: Optional[str]) -> bool:
+        left, right = _to_number(actual), _to_number(expected)
+        if left is None or right is None:
+            return False
+        return op(left, right)
+    return check
+
+
+def _date_op(op: Callable[[Any, Any], bool]):
+    def check(actual: Any, expected: Optional[str], prop_type: Optional[str]) -> bool:
+        return _compare_dates(actual, expected, op)
+    return check
+
+
+# Operators follow the names used by Notion's database query filters
+OPERATORS: Dict[str, Callable[[Any, Optional[str], Optional[str]], bool]] = {
+    "equals": _equals,
+    "does_not_equal": lambda a, v, t: not _equals(a, v, t),
+    "contains": lambda a, v, t: _contains(a, v),
+    "does_not_contain": lambda a, v, t: not _contains(a, v),
+    "starts_with": lambda a, v, t: _text(a).startswith(_text(v)),
+    "ends_with": lambda a, v, t: _text(a).endswith(_text(v)),
+    "is_empty": lambda a, v, t: _is_empty(a),
+    "is_not_empty": lambda a, v, t: not _is_empty(a),
+    "greater_than": _number_op(operator.gt),
+    "less_than": _number_op(operator.lt),
+    "greater_than_or_equal_to": _number_op(operator.ge),
+    "less_than_or_equal_to": _number_op(operator.le),
+    "before": _date_op(operator.lt),
+    "after": _date_op(operator.gt),
+    "on_or_before": _date_op(operator.le),
+    "on_or_after": _date_op(operator.ge),
+}
+
+
+def _compile_property_match(rf: Any) -> Predicate:
+    check = OPERATORS.get(rf.operator)
+    if check is None:
+        raise UnsupportedFilterError(f"Operator '{rf.operator}' cannot be evaluated locally")
+
+    property_name = rf.property_name
+    expected = rf.value
+
+    def predicate(properties: Dict[str, Any]) -> bool:
+        prop = properties.get(property_name)
+        prop_type = prop.get("type") if prop else None
+        return check(get_property_value(prop), expected, prop_type)
+
+    return predicate
+
+
+# Formula filters: a small, safe expression language over page properties,
+# e.g. prop("Status") == "Done" and prop("Score") >= 3
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_FUNCTIONS = {
+    "empty": lambda value: _is_empty(value),
+    "contains": lambda value, part: _contains(value, part),
+    "lower": lambda value: _text(value),
+    "number": lambda value: _to_number(value),
+    "date": lambda value: _to_date(value),
+    "length": lambda value: len(value) if value is not None else 0,
+}
+
+
+def _safe_compare(op: Callable[[Any, Any], bool], left: Any, right: Any) -> bool:
+    try:
+        return bool(op(left, right))
+    except TypeError:
+        return False
+
+
+def _compile_expression(node: ast.AST) -> Callable[[Dict[str, Any]], Any]:
+    if isinstance(node, ast.Expression):
+        return _compile_expression(node.body)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda properties: value
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_compile_expression(item) for item in node.elts]
+        return lambda properties: [item(properties) for item in items]
+
+    if isinstance(node, ast.BoolOp):
+        values = [_compile_expression(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda properties: all(value(properties) for value in values)
+        return lambda properties: any(value(properties) for value in values)
+
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile_expression(node.operand)
+        if isinstance(node.op, ast.Not):
+            return lambda properties: not operand(properties)
+        if isinstance(node.op, ast.USub):
+            return lambda properties: -operand(properties)
+
+    if isinstance(node, ast.Compare):
+        left = _compile_expression(node.left)
+        steps = []
+        for op_node, comparator in zip(node.ops, node.comparators):
+            op = _COMPARISONS.get(type(op_node))
+            if op is None:
+                raise UnsupportedFilterError("Unsupported comparison in formula")
+            steps.append((op, _compile_expression(comparator)))
+
+        def compare(properties: Dict[str, Any]) -> bool:
+            current = left(properties)
+            for op, comparator in steps:
+                right = comparator(properties)
+                if not _safe_compare(op, current, right):
+                    return False
+                current = right
+            return True
+
+        return compare
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        args = [_compile_expression(arg) for arg in node.args]
+        if node.func.id == "prop" and len(node.args) == 1 and isinstance(node.args[0], ast.Constant):
+            property_name = node.args[0].value
+            return lambda properties: get_property_value(properties.get(property_name))
+        func = _FUNCTIONS.get(node.func.id)
+        if func is not None:
+            return lambda properties: func(*(arg(properties) for arg in args))
+
+    raise UnsupportedFilterError(f"Unsupported formula syntax: {ast.dump(node)[:80]}")
+
+
+def _compile_formula(rf: Any) -> Predicate:
+    if not rf.formula:
+        raise UnsupportedFilterError("Formula filter has no expression")
+    try:
+        tree = ast.parse(rf.formula, mode="eval")
+    except SyntaxError as e:
+        raise UnsupportedFilterError(f"Invalid formula: {e}")
+
+    expression = _compile_expression(tree)
+
+    def predicate(properties: Dict[str, Any]) -> bool:
+        try:
+            return bool(expression(properties))
+        except (TypeError, ValueError):
+            return False
+
+    return predicate
+
+
+def compile_row_filters(row_filters: List[Any]) -> Predicate:
+    """Compile RowFilter objects into a predicate over a Notion page.
+
+    Filters are AND-ed together like build_notion_filter does. Raises
+    UnsupportedFilterError if any filter can't be evaluated in-process.
+    """
+    predicates = []
+    for rf in row_filters or []:
+        if rf.filter_type == "property_match" and rf.property_name and rf.operator:
+            predicates.append(_compile_property_match(rf))
+        elif rf.filter_type == "formula":
+            predicates.append(_compile_formula(rf))
+
+    def matches(page: Dict[str, Any]) -> bool:
+        properties = page.get("properties", {})
+        return all(predicate(properties) for predicate in predicates)
+
+    return matches
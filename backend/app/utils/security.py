@@ -3,9 +3,13 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
+import hashlib
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Scope claim of tokens that only open a sync event stream, never the API
+SYNC_EVENTS_SCOPE = "sync_events"
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -29,6 +33,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_sync_events_token(user_id: int, config_id: int) -> str:
+    """Create a short-lived JWT that only opens one config's sync event stream.
+
+    EventSource can't send headers, so this token travels in the URL where
+    logs and browser history keep it; the login token never should.
+    """
+    return create_access_token(
+        data={"sub": str(user_id), "scope": SYNC_EVENTS_SCOPE, "config_id": config_id},
+        expires_delta=timedelta(seconds=settings.sync_events_token_seconds),
+    )
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode a JWT token"""
     try:
@@ -36,3 +52,8 @@ def decode_access_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def token_fingerprint(token: str) -> str:
+    """Stable key for per-token state that avoids keeping raw tokens around"""
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,46 @@
+from typing import Any, AsyncIterator, Dict, Optional
+from collections import defaultdict
+from contextlib import contextmanager
+import time
+
+
+class PhaseTimings:
+    """Wall time spent in named phases of one unit of work.
+
+    Nested phases count toward the outermost one, so e.g. the writes issued
+    while archiving are reported as 'archive' and nothing is counted twice.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.current: Optional[str] = None  # Last outermost phase entered
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        if self._depth:
+            yield
+            return
+        self._depth += 1
+        self.current = name
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.seconds[name] += time.perf_counter() - started_at
+
+    async def timed(self, name: str, iterator: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Iterate `iterator`, counting the time spent waiting for each item as `name`"""
+        iterator = iterator.__aiter__()
+        while True:
+            with self.phase(name):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+
+    def as_dict(self) -> Dict[str, float]:
+        """Seconds per phase, rounded to milliseconds to keep the JSON compact"""
+        return {name: round(seconds, 3) for name, seconds in self.seconds.items()}
@@ -0,0 +1,232 @@
+"""In-process stand-in for the parts of the Notion API the sync engine uses.
+
+Plug it in with `app.services.notion_clients.set_notion_transport(FakeNotion().transport)`.
+Supports databases.query (with cursors and the filters the engine sends),
+databases.create/retrieve, pages.create/update/retrieve and search, plus
+simulated latency, a server-side rate limit and random 429s.
+"""
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from app.utils.row_filters import OPERATORS, get_property_value
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+import httpx
+
+
+def _now() -> str:
+    # Like Notion, page timestamps only keep the minute
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    return now.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _error(status: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    return httpx.Response(
+        status,
+        json={"object": "error", "status": status, "code": code, "message": message},
+        headers=headers,
+    )
+
+
+class FakeNotion:
+    """Notion API served from memory through an httpx transport"""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: Optional[float] = None,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        # Rows per database in creation order, so pagination is stable
+        self.rows: Dict[str, List[str]] = {}
+
+        self.calls = 0
+        self.throttled = 0
+        self.latencies: List[float] = []
+        self._allowance = rate_limit or 0.0
+        self._allowance_at = time.monotonic()
+        self.transport = _TimedTransport(httpx.MockTransport(self._handle), self.latencies)
+
+    # Fixtures
+
+    def add_database(self, title: str, properties: Dict[str, Any], parent_page_id: Optional[str] = None) -> str:
+        db_id = str(uuid.uuid4())
+        self.databases[db_id] = {
+            "object": "database",
+            "id": db_id,
+            "title": [{"type": "text", "plain_text": title, "text": {"content": title}}],
+            "parent": {"type": "page_id", "page_id": parent_page_id},
+            "properties": {
+                name: {"id": f"p{i}", "name": name, **prop}
+                for i, (name, prop) in enumerate(properties.items())
+            },
+        }
+        self.rows[db_id] = []
+        return db_id
+
+    def add_page(self, parent: Dict[str, Any], properties: Dict[str, Any]) -> str:
+        page_id = str(uuid.uuid4())
+        timestamp = _now()
+        self.pages[page_id] = {
+            "object": "page",
+            "id": page_id,
+            "parent": parent,
+            "created_time": timestamp,
+            "last_edited_time": timestamp,
+            "archived": False,
+            "properties": properties,
+        }
+        if "database_id" in parent:
+            self.rows.setdefault(parent["database_id"], []).append(page_id)
+        return page_id
+
+    def edit_page(self, page_id: str, properties: Dict[str, Any]):
+        page = self.pages[page_id]
+        page["properties"] = {**page["properties"], **properties}
+        page["last_edited_time"] = _now()
+
+    def reset_stats(self):
+        self.calls = 0
+        self.throttled = 0
+        self.latencies.clear()
+
+    # Request handling
+
+    def _rate_limited(self) -> bool:
+        if self.error_rate and self.random.random() < self.error_rate:
+            return True
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        self._allowance = min(
+            self.rate_limit, self._allowance + (now - self._allowance_at) * self.rate_limit
+        )
+        self._allowance_at = now
+        if self._allowance < 1:
+            return True
+        self._allowance -= 1
+        return False
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+        if self._rate_limited():
+            self.throttled += 1
+            return _error(429, "rate_limited", "Rate limited", {"Retry-After": str(self.retry_after)})
+
+        path = request.url.path.removeprefix("/v1")
+        body = json.loads(request.content) if request.content else {}
+        method = request.method
+
+        match = re.fullmatch(r"/databases/([^/]+)/query", path)
+        if match and method == "POST":
+            return self._query(match.group(1), body)
+        match = re.fullmatch(r"/databases/([^/]+)", path)
+        if match and method == "GET":
+            return self._get(self.databases, match.group(1))
+        if path == "/databases" and method == "POST":
+            db_id = self.add_database(
+                body["title"][0]["text"]["content"] if body.get("title") else "",
+                body.get("properties", {}),
+                body.get("parent", {}).get("page_id"),
+            )
+            return httpx.Response(200, json=self.databases[db_id])
+        if path == "/pages" and method == "POST":
+            page_id = self.add_page(body["parent"], body.get("properties", {}))
+            return httpx.Response(200, json=self.pages[page_id])
+        match = re.fullmatch(r"/pages/([^/]+)", path)
+        if match and method == "GET":
+            return self._get(self.pages, match.group(1))
+        if match and method == "PATCH":
+            return self._update_page(match.group(1), body)
+        if path == "/search" and method == "POST":
+            return httpx.Response(200, json={"object": "list", "results": [], "has_more": False, "next_cursor": None})
+        return _error(400, "invalid_request_url", f"Unsupported endpoint {method} {path}")
+
+    def _get(self, objects: Dict[str, Dict[str, Any]], object_id: str) -> httpx.Response:
+        if object_id not in objects:
+            return _error(404, "object_not_found", f"Could not find {object_id}")
+        return httpx.Response(200, json=objects[object_id])
+
+    def _update_page(self, page_id: str, body: Dict[str, Any]) -> httpx.Response:
+        if page_id not in self.pages:
+            return _error(404, "object_not_found", f"Could not find page {page_id}")
+        if body.get("properties"):
+            self.edit_page(page_id, body["properties"])
+        if "archived" in body:
+            self.pages[page_id]["archived"] = body["archived"]
+        return httpx.Response(200, json=self.pages[page_id])
+
+    def _query(self, db_id: str, body: Dict[str, Any]) -> httpx.Response:
+        if db_id not in self.databases:
+            return _error(404, "object_not_found", f"Could not find database {db_id}")
+        page_size = min(100, body.get("page_size", 100))
+        start = int(body.get("start_cursor") or 0)
+        filter_obj = body.get("filter")
+
+        # Cursors are offsets into the unfiltered row list, like Notion the
+        # response may come back short when rows don't match
+        results = []
+        position = start
+        row_ids = self.rows[db_id]
+        while position < len(row_ids) and len(results) < page_size:
+            page = self.pages[row_ids[position]]
+            position += 1
+            if not page["archived"] and _matches(page, filter_obj):
+                results.append(page)
+
+        has_more = position < len(row_ids)
+        return httpx.Response(200, json={
+            "object": "list",
+            "results": results,
+            "has_more": has_more,
+            "next_cursor": str(position) if has_more else None,
+        })
+
+
+def _matches(page: Dict[str, Any], filter_obj: Optional[Dict[str, Any]]) -> bool:
+    if not filter_obj:
+        return True
+    if "and" in filter_obj:
+        return all(_matches(page, f) for f in filter_obj["and"])
+    if "or" in filter_obj:
+        return any(_matches(page, f) for f in filter_obj["or"])
+    if filter_obj.get("timestamp"):
+        (operator, value), = filter_obj[filter_obj["timestamp"]].items()
+        return OPERATORS[operator](page[filter_obj["timestamp"]], value, "date")
+
+    prop = page["properties"].get(filter_obj["property"])
+    (prop_type, condition), = ((k, v) for k, v in filter_obj.items() if k != "property")
+    (operator, value), = condition.items()
+    return OPERATORS[operator](get_property_value(prop), value, prop_type)
+
+
+class _TimedTransport(httpx.AsyncBaseTransport):
+    """Records how long every request took, as seen by the client"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, latencies: List[float]):
+        self._transport = transport
+        self._latencies = latencies
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self._latencies.append(time.perf_counter() - started)
@@ -0,0 +1,242 @@
+"""Measure NotionSyncEngine throughput against the in-process fake Notion API.
+
+Run from the backend directory:
+
+    python -m benchmarks.sync_benchmark --rows 1000,10000,100000 --users 3
+
+Each size runs in its own process on a throwaway SQLite database (so peak
+RSS is per size) through three phases: the initial mirror, a no-op sync
+and a sync after editing --update-ratio of the source rows.
+"""
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+STATUSES = ["Todo", "In progress", "Done", "Blocked"]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,10000,100000", help="Comma separated source database sizes")
+    parser.add_argument("--users", type=int, default=3, help="User mirrors per config")
+    parser.add_argument("--filtered", action="store_true", help="Give each user a Status row filter")
+    parser.add_argument("--update-ratio", type=float, default=0.1, help="Share of rows edited before the update phase")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency per call, in seconds")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second the fake API allows")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with a random 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After sent with 429s, in seconds")
+    parser.add_argument("--client-rate", type=float, default=None,
+                        help="Client-side rate limit (default: --rate-limit, or unlimited)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args(argv)
+
+
+def _configure_environment(db_path: str):
+    """Point the app at a throwaway database before anything imports its settings"""
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{db_path}",
+        ENVIRONMENT="benchmark",
+        NOTION_REDIRECT_URI="http://localhost/callback",
+        JWT_SECRET_KEY="benchmark",
+        FRONTEND_URL="http://localhost",
+    )
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _seed(fake, db, models, args, rows: int) -> int:
+    owner = models.User(email="owner@example.com", password_hash="x", notion_access_token="benchmark-token")
+    db.add(owner)
+    db.flush()
+
+    parent_page_id = fake.add_page({"type": "workspace", "workspace": True}, {})
+    source_id = fake.add_database("Benchmark source", {
+        "Name": {"type": "title", "title": {}},
+        "Status": {"type": "select", "select": {"options": [{"name": s} for s in STATUSES]}},
+        "Points": {"type": "number", "number": {}},
+        "Notes": {"type": "rich_text", "rich_text": {}},
+    })
+    for i in range(rows):
+        fake.add_page({"type": "database_id", "database_id": source_id}, {
+            "Name": {"type": "title", "title": [{"type": "text", "plain_text": f"Row {i}", "text": {"content": f"Row {i}"}}]},
+            "Status": {"type": "select", "select": {"name": STATUSES[i % len(STATUSES)]}},
+            "Points": {"type": "number", "number": i % 13},
+            "Notes": {"type": "rich_text", "rich_text": []},
+        })
+
+    config = models.DatabaseConfig(
+        owner_user_id=owner.id,
+        source_database_id=source_id,
+        parent_page_id=parent_page_id,
+        config_name="Benchmark",
+    )
+    db.add(config)
+    db.flush()
+    for name, writable in (("Name", True), ("Status", False), ("Points", False), ("Notes", True)):
+        db.add(models.PropertyMapping(config_id=config.id, property_name=name, is_visible=True, is_writable=writable))
+
+    for i in range(args.users):
+        user_perm = models.UserPermission(
+            config_id=config.id,
+            user_email=f"user{i}@example.com",
+            access_level="write" if i == 0 else "read",
+        )
+        if args.filtered:
+            user_perm.row_filters.append(models.RowFilter(
+                config_id=config.id,
+                filter_type="property_match",
+                property_name="Status",
+                operator="equals",
+                value=STATUSES[i % len(STATUSES)],
+            ))
+        db.add(user_perm)
+
+    db.commit()
+    return config.id
+
+
+def run_size(args: argparse.Namespace, rows: int) -> Dict[str, Any]:
+    """Benchmark one source size in this process"""
+    db_file = tempfile.NamedTemporaryFile(prefix="notionshare-bench-", suffix=".db", delete=False)
+    db_file.close()
+    _configure_environment(db_file.name)
+
+    from app.config import settings
+    from app.database import Base, SessionLocal, engine
+    from app.services.notion_clients import close_notion_clients, set_notion_transport
+    from app.services.sync import NotionSyncEngine
+    from benchmarks.fake_notion import FakeNotion
+    import app.models as models
+
+    client_rate = args.client_rate or args.rate_limit or 1_000_000
+    settings.notion_rate_limit_per_second = client_rate
+    settings.notion_rate_limit_burst = max(1, int(min(client_rate, 1000)))
+    settings.sync_worker_shared_loop = False
+
+    fake = FakeNotion(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+    )
+    set_notion_transport(fake.transport)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        config_id = _seed(fake, db, models, args, rows)
+        source_id = db.get(models.DatabaseConfig, config_id).source_database_id
+    finally:
+        db.close()
+
+    async def sync_phase(name: str) -> Dict[str, Any]:
+        fake.reset_stats()
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            sync_log = await NotionSyncEngine(db).sync_database(config_id, sync_type="benchmark")
+            elapsed = time.perf_counter() - started
+            writes = sync_log.rows_created + sync_log.rows_updated
+            return {
+                "phase": name,
+                "rows": rows,
+                "users": args.users,
+                "status": sync_log.status,
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(rows * args.users / elapsed, 1),
+                "writes": writes,
+                "api_calls": fake.calls,
+                "calls_per_row": round(fake.calls / (rows * args.users), 3),
+                "throttled": fake.throttled,
+                "p50_ms": round(_percentile(fake.latencies, 50) * 1000, 2),
+                "p99_ms": round(_percentile(fake.latencies, 99) * 1000, 2),
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+            }
+        finally:
+            db.close()
+
+    async def run_phases() -> List[Dict[str, Any]]:
+        try:
+            results = [await sync_phase("initial"), await sync_phase("noop")]
+            if args.update_ratio:
+                step = max(1, round(1 / args.update_ratio))
+                for page_id in fake.rows[source_id][::step]:
+                    fake.edit_page(page_id, {"Points": {"type": "number", "number": -1}})
+            results.append(await sync_phase("update"))
+            return results
+        finally:
+            await close_notion_clients()
+
+    try:
+        return {"rows": rows, "phases": asyncio.run(run_phases())}
+    finally:
+        os.unlink(db_file.name)
+
+
+def _run_in_subprocess(argv: List[str], rows: int) -> Dict[str, Any]:
+    """Run one size in a fresh interpreter so peak RSS isn't shared between sizes"""
+    rows_at = argv.index("--rows") if "--rows" in argv else None
+    child_argv = [a for i, a in enumerate(argv) if rows_at is None or i not in (rows_at, rows_at + 1)]
+    child_argv = [a for a in child_argv if not a.startswith("--rows=") and a != "--json"]
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.sync_benchmark", *child_argv, "--rows", str(rows), "--json"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark for {rows} rows failed:\n{result.stderr}")
+    # The engine prints progress, the results are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])[0]
+
+
+def print_table(results: List[Dict[str, Any]]):
+    columns = ["rows", "users", "phase", "status", "seconds", "rows_per_sec", "writes", "api_calls",
+               "calls_per_row", "throttled", "p50_ms", "p99_ms", "peak_rss_mb"]
+    lines = [[str(phase[c]) for c in columns] for result in results for phase in result["phases"]]
+    widths = [max(len(c), *(len(line[i]) for line in lines)) for i, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for line in lines:
+        print("  ".join(v.rjust(w) for v, w in zip(line, widths)))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.rows.split(",") if size.strip()]
+
+    if len(sizes) == 1:
+        results = [run_size(args, sizes[0])]
+    else:
+        results = [_run_in_subprocess(argv, rows) for rows in sizes]
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
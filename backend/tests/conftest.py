@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before anything imports its settings
+_db_file = tempfile.NamedTemporaryFile(prefix="notionshare-test-", suffix=".db", delete=False)
+_db_file.close()
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_db_file.name}",
+    ENVIRONMENT="test",
+    NOTION_REDIRECT_URI="http://localhost/callback",
+    JWT_SECRET_KEY="test",
+    FRONTEND_URL="http://localhost",
+)
+
+import asyncio
+import pytest
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.services.notion_clients import close_notion_clients, set_notion_transport
+from app.services.sync import NotionSyncEngine
+from benchmarks.fake_notion import FakeNotion
+import app.models as models
+
+
+def pytest_sessionfinish(session, exitstatus):
+    os.unlink(_db_file.name)
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def fake_notion(monkeypatch):
+    """In-process Notion API without client-side throttling"""
+    monkeypatch.setattr(settings, "notion_rate_limit_per_second", 1_000_000)
+    monkeypatch.setattr(settings, "notion_rate_limit_burst", 1000)
+    fake = FakeNotion()
+    set_notion_transport(fake.transport)
+    try:
+        yield fake
+    finally:
+        set_notion_transport(None)
+
+
+def title(text: str):
+    return {"type": "title", "title": [{"type": "text", "plain_text": text, "text": {"content": text}}]}
+
+
+def run_sync(db, config_id):
+    async def run():
+        try:
+            return await NotionSyncEngine(db).sync_database(config_id)
+        finally:
+            await close_notion_clients()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def make_config(db, fake_notion):
+    """Seed a source database with `rows` rows and a config mirroring it to `users` users"""
+
+    def make(rows: int = 3, users: int = 2, access_level: str = "write") -> models.DatabaseConfig:
+        owner = models.User(email="owner@example.com", password_hash="x", notion_access_token="test-token")
+        db.add(owner)
+        db.flush()
+
+        parent_page_id = fake_notion.add_page({"type": "workspace", "workspace": True}, {})
+        source_id = fake_notion.add_database("Source", {
+            "Name": {"type": "title", "title": {}},
+            "Points": {"type": "number", "number": {}},
+        })
+        for i in range(rows):
+            fake_notion.add_page({"type": "database_id", "database_id": source_id}, {
+                "Name": title(f"Row {i}"),
+                "Points": {"type": "number", "number": i},
+            })
+
+        config = models.DatabaseConfig(
+            owner_user_id=owner.id,
+            source_database_id=source_id,
+            parent_page_id=parent_page_id,
+            config_name="Test",
+        )
+        db.add(config)
+        db.flush()
+        db.add(models.PropertyMapping(config_id=config.id, property_name="Name", is_visible=True, is_writable=True))
+        db.add(models.PropertyMapping(config_id=config.id, property_name="Points", is_visible=True, is_writable=False))
+        for i in range(users):
+            db.add(models.UserPermission(config_id=config.id, user_email=f"user{i}@example.com", access_level=access_level))
+        db.commit()
+        return config
+
+    return make
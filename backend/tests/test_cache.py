@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+import asyncio
+import pytest
+import app.utils.cache as cache_module
+from app.utils.cache import AsyncTTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=5)
+
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    clock.now += 55
+    assert cache.get("default", "missing") == "missing"
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AsyncTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_callers_get_copies(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    cache.set("schema", {"properties": ["Name"]})
+    cache.get("schema")["properties"].append("Points")
+    assert cache.get("schema") == {"properties": ["Name"]}
+
+
+def test_invalidate_where(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    for key in [("token-1", "db-1"), ("token-1", "db-2"), ("token-2", "db-1")]:
+        cache.set(key, True)
+    cache.invalidate_where(lambda key: key[0] == "token-1")
+    assert cache.get(("token-1", "db-1")) is None
+    assert cache.get(("token-2", "db-1")) is True
+
+
+def test_concurrent_misses_share_one_load(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(5)))
+        results.append(await cache.get_or_load("key", loader))
+        return results
+
+    results = asyncio.run(run())
+    assert calls == [1]
+    assert results == [{"value": 1}] * 6
+    # Every caller has its own copy
+    assert len({id(result) for result in results}) == 6
+
+
+def test_failed_load_is_not_cached(clock):
+    cache = AsyncTTLCache(maxsize=10, ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("Notion is down")
+        return "loaded"
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("key", loader)
+        return await cache.get_or_load("key", loader)
+
+    assert asyncio.run(run()) == "loaded"
+    assert len(calls) == 2
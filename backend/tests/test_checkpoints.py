@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+import httpx
+import json
+import pytest
+from app.config import settings
+from app.models import PageMapping, UserPermission
+from tests.conftest import run_sync
+
+
+def test_resumed_full_scan_archives_only_deleted_rows(db, fake_notion, make_config, monkeypatch):
+    monkeypatch.setattr(settings, "sync_checkpoint_every_batches", 1)
+    # 250 rows are 3 pages of results
+    config = make_config(rows=250, users=1)
+    assert run_sync(db, config.id).status == "success"
+    user = db.query(UserPermission).one()
+
+    deleted_id = fake_notion.rows[config.source_database_id][0]
+    deleted_mirror_id = db.query(PageMapping).filter_by(source_page_id=deleted_id).one().target_page_id
+    fake_notion.pages[deleted_id]["archived"] = True
+    user.last_full_sync_at = datetime.utcnow() - timedelta(days=1)
+    db.commit()
+
+    # The full scan is interrupted before its last page
+    handle = fake_notion._handle
+    source_queries = []
+
+    async def fail_last_page(request):
+        if request.url.path == f"/v1/databases/{config.source_database_id}/query":
+            source_queries.append(request)
+            if len(source_queries) == 3:
+                return httpx.Response(400, json={
+                    "object": "error", "status": 400, "code": "validation_error", "message": "Interrupted",
+                })
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(fail_last_page))
+    with pytest.raises(Exception):
+        run_sync(db, config.id)
+
+    # The checkpoint holds the cursor, not every row seen so far
+    db.refresh(user)
+    assert user.sync_checkpoint["cursor"] == json.loads(source_queries[2].content)["start_cursor"]
+    assert user.sync_checkpoint["matched"] == 200
+    assert len(json.dumps(user.sync_checkpoint)) < 1000
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(handle))
+    archived_before = sum(page["archived"] for page in fake_notion.pages.values())
+    assert run_sync(db, config.id).status == "success"
+
+    assert fake_notion.pages[deleted_mirror_id]["archived"]
+    assert sum(page["archived"] for page in fake_notion.pages.values()) == archived_before + 1
+    assert db.query(PageMapping).count() == 249
+    db.refresh(user)
+    assert user.sync_checkpoint is None
@@ -0,0 +1,34 @@
+from app.models import PageMapping, RowFilter, UserPermission
+from tests.conftest import run_sync
+
+
+def test_row_edited_out_of_the_filter_leaves_the_mirror(db, fake_notion, make_config):
+    config = make_config(rows=3, users=1)
+    user = db.query(UserPermission).one()
+    user.row_filters = [RowFilter(
+        config_id=config.id, filter_type="property_match",
+        property_name="Points", operator="less_than", value="10",
+    )]
+    db.commit()
+    assert run_sync(db, config.id).status == "success"
+    full_sync_at = user.last_full_sync_at
+
+    source_id = fake_notion.rows[config.source_database_id][0]
+    mapping = db.query(PageMapping).filter_by(user_permission_id=user.id, source_page_id=source_id).one()
+    target_id = mapping.target_page_id
+    fake_notion.edit_page(source_id, {"Points": {"type": "number", "number": 50}})
+
+    # An incremental run, not the next full scan, takes the row out
+    assert run_sync(db, config.id).status == "success"
+    db.refresh(user)
+    assert user.last_full_sync_at == full_sync_at
+    assert fake_notion.pages[target_id]["archived"]
+    assert db.query(PageMapping).filter_by(user_permission_id=user.id, source_page_id=source_id).count() == 0
+    assert db.query(PageMapping).filter_by(user_permission_id=user.id).count() == 2
+
+    # Back inside the filter, the row is mirrored again
+    fake_notion.edit_page(source_id, {"Points": {"type": "number", "number": 5}})
+    assert run_sync(db, config.id).status == "success"
+    mapping = db.query(PageMapping).filter_by(user_permission_id=user.id, source_page_id=source_id).one()
+    assert mapping.target_page_id != target_id
+    assert fake_notion.pages[mapping.target_page_id]["properties"]["Points"]["number"] == 5
@@ -0,0 +1,39 @@
+import asyncio
+from app.config import settings
+from app.services.notion_clients import close_notion_clients, get_notion_client
+
+
+def test_client_in_use_is_not_evicted(fake_notion, monkeypatch):
+    monkeypatch.setattr(settings, "notion_client_idle_seconds", 0.2)
+
+    async def run():
+        try:
+            busy = get_notion_client("busy-token")
+            # Keep using the client for longer than the idle timeout
+            for _ in range(4):
+                await busy.search()
+                await asyncio.sleep(0.1)
+            # Fetching another token's client evicts idle clients only
+            get_notion_client("other-token")
+            await busy.search()
+            assert get_notion_client("busy-token") is busy
+        finally:
+            await close_notion_clients()
+
+    asyncio.run(run())
+
+
+def test_idle_client_is_evicted(fake_notion, monkeypatch):
+    monkeypatch.setattr(settings, "notion_client_idle_seconds", 0.05)
+
+    async def run():
+        try:
+            idle = get_notion_client("idle-token")
+            await idle.search()
+            await asyncio.sleep(0.1)
+            get_notion_client("other-token")
+            assert get_notion_client("idle-token") is not idle
+        finally:
+            await close_notion_clients()
+
+    asyncio.run(run())
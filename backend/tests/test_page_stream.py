@@ -0,0 +1,124 @@
+from contextlib import aclosing
+import asyncio
+import pytest
+from app.services.page_stream import SharedPageStream
+
+
+class Source:
+    """Async batch source recording how far it was read"""
+
+    def __init__(self, batches, fail_at=None):
+        self.batches = batches
+        self.fail_at = fail_at
+        self.fetched = 0
+
+    async def __aiter__(self):
+        for i, batch in enumerate(self.batches):
+            await asyncio.sleep(0)
+            if i == self.fail_at:
+                raise RuntimeError("query failed")
+            self.fetched += 1
+            yield batch
+
+
+async def read(stream, delay=0.0, stop_after=None, fail_after=None, peak=None):
+    seen = []
+    async with aclosing(stream.consume()) as batches:
+        async for batch in batches:
+            seen.append(batch)
+            if peak is not None:
+                peak.append(stream.buffered)
+            if len(seen) == stop_after:
+                break
+            if len(seen) == fail_after:
+                raise ValueError("consumer failed")
+            await asyncio.sleep(delay)
+    return seen
+
+
+def test_single_consumer_reads_every_batch_in_order():
+    async def run():
+        stream = SharedPageStream(Source(list(range(10))).__aiter__())
+        return await read(stream)
+
+    assert asyncio.run(run()) == list(range(10))
+
+
+def test_buffer_is_bounded_by_the_slowest_consumer():
+    async def run():
+        stream = SharedPageStream(Source(list(range(30))).__aiter__(), prefetch=2)
+        peak = []
+        fast, slow = await asyncio.gather(
+            read(stream, peak=peak),
+            read(stream, delay=0.001, peak=peak),
+        )
+        return fast, slow, max(peak), stream.buffered
+
+    fast, slow, peak, buffered = asyncio.run(run())
+    assert fast == slow == list(range(30))
+    assert peak <= 2
+    assert buffered == 0
+
+
+def test_consumer_that_stops_early_releases_its_batches():
+    async def run():
+        source = Source(list(range(20)))
+        stream = SharedPageStream(source.__aiter__(), prefetch=2)
+        partial, full = await asyncio.gather(
+            read(stream, stop_after=3),
+            read(stream, delay=0.001),
+        )
+        return partial, full, stream.buffered
+
+    partial, full, buffered = asyncio.run(run())
+    assert partial == [0, 1, 2]
+    assert full == list(range(20))
+    assert buffered == 0
+
+
+def test_failed_consumer_releases_its_batches():
+    async def run():
+        stream = SharedPageStream(Source(list(range(20))).__aiter__(), prefetch=2)
+        failed, full = await asyncio.gather(
+            read(stream, fail_after=2),
+            read(stream, delay=0.001),
+            return_exceptions=True,
+        )
+        return failed, full, stream.buffered
+
+    failed, full, buffered = asyncio.run(run())
+    assert isinstance(failed, ValueError)
+    assert full == list(range(20))
+    assert buffered == 0
+
+
+def test_stream_cannot_be_joined_after_dropping_batches():
+    async def run():
+        stream = SharedPageStream(Source(list(range(5))).__aiter__())
+        assert stream.joinable
+        await read(stream, stop_after=2)
+        assert not stream.joinable
+        with pytest.raises(RuntimeError):
+            await read(stream)
+
+    asyncio.run(run())
+
+
+def test_producer_stops_when_every_consumer_left():
+    async def run():
+        source = Source(list(range(100)))
+        stream = SharedPageStream(source.__aiter__(), prefetch=2)
+        await read(stream, stop_after=1)
+        await asyncio.sleep(0.01)
+        return source.fetched
+
+    assert asyncio.run(run()) < 10
+
+
+def test_source_errors_reach_every_consumer():
+    async def run():
+        stream = SharedPageStream(Source(list(range(5)), fail_at=3).__aiter__())
+        return await asyncio.gather(read(stream), read(stream), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) and str(result) == "query failed" for result in results)
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+import pytest
+import app.utils.rate_limiter as rate_limiter
+from app.utils.rate_limiter import TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def test_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # Further callers queue up behind each other at the refill rate
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    for _ in range(3):
+        bucket.reserve()
+
+    clock.now += 1
+    assert [bucket.reserve() for _ in range(2)] == [0, 0]
+    assert bucket.reserve() == 0.5
+
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == 0.5
+
+
+def test_throttle_halves_rate_and_pauses(clock):
+    bucket = TokenBucket(rate=4, capacity=4)
+    bucket.throttle(retry_after=2)
+    assert bucket.rate == 2
+    # No tokens left and none accrue until Retry-After is over
+    assert bucket.reserve() == 2 + 0.5
+
+    clock.now += 1
+    assert bucket.reserve() == 1 + 1.0
+
+
+def test_concurrent_throttles_count_once(clock):
+    bucket = TokenBucket(rate=4, capacity=4)
+    bucket.throttle(retry_after=2)
+    bucket.throttle(retry_after=2)
+    assert bucket.rate == 2
+
+    clock.now += 3
+    bucket.throttle()
+    assert bucket.rate == 1
+
+
+def test_rate_stays_between_min_and_max(clock):
+    bucket = TokenBucket(rate=4, capacity=4, min_rate=1)
+    for _ in range(5):
+        bucket.throttle()
+    assert bucket.rate == 1
+
+    for _ in range(100):
+        bucket.recover()
+    assert bucket.rate == 4
+
+
+def test_recover_restores_rate_step_by_step(clock):
+    bucket = TokenBucket(rate=4, capacity=4)
+    bucket.throttle()
+    bucket.recover()
+    assert bucket.rate == pytest.approx(2.2)
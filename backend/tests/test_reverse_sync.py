@@ -0,0 +1,113 @@
+import asyncio
+import httpx
+import json
+from app.config import settings
+from app.models import PageMapping, UserPermission
+from tests.conftest import run_sync, title
+
+
+def page_title(fake, page_id):
+    return fake.pages[page_id]["properties"]["Name"]["title"][0]["plain_text"]
+
+
+def test_mirror_edit_survives_concurrent_write_users(db, fake_notion, make_config, monkeypatch):
+    monkeypatch.setattr(settings, "sync_max_concurrent_users", 4)
+    config = make_config(rows=3, users=2)
+    assert run_sync(db, config.id).status == "success"
+
+    user_a, user_b = db.query(UserPermission).order_by(UserPermission.id).all()
+    source_id = fake_notion.rows[config.source_database_id][1]
+    mirror_a = db.query(PageMapping).filter_by(user_permission_id=user_a.id, source_page_id=source_id).one()
+    fake_notion.edit_page(mirror_a.target_page_id, {"Name": title("Edited by A")})
+
+    # B's reverse pass reads its (stale) mirror after A has pushed its edit
+    delays = {user_a.target_database_id: 0.1, user_b.target_database_id: 0.2}
+    handle = fake_notion._handle
+
+    async def delayed_handle(request):
+        for db_id, delay in delays.items():
+            if db_id in request.url.path:
+                await asyncio.sleep(delay)
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(delayed_handle))
+
+    assert run_sync(db, config.id).status == "success"
+    assert page_title(fake_notion, source_id) == "Edited by A"
+
+    # The next run brings B's mirror up to date instead of reverting the source
+    assert run_sync(db, config.id).status == "success"
+    mirror_b = db.query(PageMapping).filter_by(user_permission_id=user_b.id, source_page_id=source_id).one()
+    assert page_title(fake_notion, source_id) == "Edited by A"
+    assert page_title(fake_notion, mirror_b.target_page_id) == "Edited by A"
+
+
+def test_unedited_mirrors_are_not_pushed_back(db, fake_notion, make_config):
+    config = make_config(rows=3, users=2)
+    run_sync(db, config.id)
+    source_id = fake_notion.rows[config.source_database_id][0]
+
+    # The owner edits the source, mirrors still show the old title
+    fake_notion.edit_page(source_id, {"Name": title("Edited by owner")})
+    run_sync(db, config.id)
+
+    assert page_title(fake_notion, source_id) == "Edited by owner"
+
+
+def test_failed_write_does_not_update_the_snapshot(db, fake_notion, make_config, monkeypatch):
+    monkeypatch.setattr(settings, "sync_max_concurrent_users", 4)
+    config = make_config(rows=3, users=2)
+    run_sync(db, config.id)
+    user_a, user_b = db.query(UserPermission).order_by(UserPermission.id).all()
+    source_id = fake_notion.rows[config.source_database_id][0]
+    for mapping in db.query(PageMapping).filter_by(source_page_id=source_id):
+        fake_notion.edit_page(mapping.target_page_id, {"Name": title("Same edit")})
+
+    # Both forward passes finish, then A's write is rejected and B reads its
+    # mirror afterwards: B must still push the edit
+    delays = {user_a.target_database_id: 0.1, user_b.target_database_id: 0.3}
+    handle = fake_notion._handle
+    rejected = []
+
+    async def reject_first_write(request):
+        if request.method == "PATCH" and source_id in request.url.path and not rejected:
+            rejected.append(request)
+            return httpx.Response(400, json={
+                "object": "error", "status": 400, "code": "validation_error", "message": "Rejected",
+            })
+        for db_id, delay in delays.items():
+            if db_id in request.url.path:
+                await asyncio.sleep(delay)
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(reject_first_write))
+
+    run_sync(db, config.id)
+    assert rejected
+    assert page_title(fake_notion, source_id) == "Same edit"
+
+
+def test_edits_to_rows_deleted_from_the_source_are_read_once(db, fake_notion, make_config, monkeypatch):
+    config = make_config(rows=3, users=1)
+    run_sync(db, config.id)
+    source_id = fake_notion.rows[config.source_database_id][0]
+    mirror = db.query(PageMapping).filter_by(source_page_id=source_id).one()
+    fake_notion.pages[source_id]["archived"] = True
+    fake_notion.edit_page(mirror.target_page_id, {"Name": title("Edited after delete")})
+
+    # Unfiltered source queries are the reverse sync reading the whole source
+    full_reads = []
+    handle = fake_notion._handle
+
+    async def counting_handle(request):
+        if request.url.path == f"/v1/databases/{config.source_database_id}/query":
+            if "filter" not in json.loads(request.content):
+                full_reads.append(request)
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(counting_handle))
+
+    run_sync(db, config.id)
+    assert len(full_reads) == 1
+    run_sync(db, config.id)
+    assert len(full_reads) == 1
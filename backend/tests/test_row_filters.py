@@ -0,0 +1,141 @@
+import pytest
+from app.models import RowFilter
+from app.utils.row_filters import UnsupportedFilterError, compile_row_filters
+from tests.conftest import title
+
+
+def page(**properties):
+    return {"properties": properties}
+
+
+def number(value):
+    return {"type": "number", "number": value}
+
+
+def checkbox(value):
+    return {"type": "checkbox", "checkbox": value}
+
+
+def date(start):
+    return {"type": "date", "date": {"start": start} if start else None}
+
+
+def multi_select(*names):
+    return {"type": "multi_select", "multi_select": [{"name": name} for name in names]}
+
+
+def matches(row_page, *row_filters):
+    return compile_row_filters(list(row_filters))(row_page)
+
+
+def where(property_name, operator, value=None):
+    return RowFilter(filter_type="property_match", property_name=property_name, operator=operator, value=value)
+
+
+def formula(expression):
+    return RowFilter(filter_type="formula", formula=expression)
+
+
+def test_text_operators_ignore_case():
+    row = page(Name=title("Quarterly Report"))
+    assert matches(row, where("Name", "equals", "Quarterly Report"))
+    assert not matches(row, where("Name", "equals", "quarterly report"))
+    assert matches(row, where("Name", "contains", "REPORT"))
+    assert matches(row, where("Name", "starts_with", "quarterly"))
+    assert matches(row, where("Name", "ends_with", "report"))
+    assert matches(row, where("Name", "does_not_contain", "draft"))
+
+
+def test_emptiness():
+    assert matches(page(Name=title("")), where("Name", "is_empty"))
+    assert matches(page(Tags=multi_select()), where("Tags", "is_empty"))
+    assert matches(page(), where("Missing", "is_empty"))
+    assert matches(page(Points=number(0)), where("Points", "is_not_empty"))
+
+
+def test_lists_match_their_items():
+    row = page(Tags=multi_select("urgent", "backend"))
+    assert matches(row, where("Tags", "contains", "urgent"))
+    assert matches(row, where("Tags", "equals", "backend"))
+    assert not matches(row, where("Tags", "contains", "urg"))
+
+
+def test_numbers_are_compared_as_numbers():
+    row = page(Points=number(10))
+    assert matches(row, where("Points", "equals", "10"))
+    assert matches(row, where("Points", "equals", "10.0"))
+    assert matches(row, where("Points", "greater_than", "9"))
+    assert not matches(row, where("Points", "greater_than", "10"))
+    assert matches(row, where("Points", "less_than_or_equal_to", "10"))
+    # Text and empty values never satisfy a numeric comparison
+    assert not matches(row, where("Points", "greater_than", "abc"))
+    assert not matches(page(Points=number(None)), where("Points", "less_than", "5"))
+
+
+def test_checkbox_values_are_coerced():
+    assert matches(page(Done=checkbox(True)), where("Done", "equals", "true"))
+    assert matches(page(Done=checkbox(True)), where("Done", "equals", "Checked"))
+    assert matches(page(Done=checkbox(False)), where("Done", "equals", "false"))
+    assert matches(page(Done=checkbox(False)), where("Done", "does_not_equal", "yes"))
+
+
+def test_date_only_values_compare_by_day():
+    row = page(Due=date("2024-05-01T15:30:00.000+00:00"))
+    assert matches(row, where("Due", "equals", "2024-05-01"))
+    assert matches(row, where("Due", "on_or_after", "2024-05-01"))
+    assert matches(row, where("Due", "on_or_before", "2024-05-01"))
+    assert not matches(row, where("Due", "after", "2024-05-01"))
+    assert matches(row, where("Due", "before", "2024-05-02"))
+
+
+def test_datetimes_compare_precisely():
+    row = page(Due=date("2024-05-01T15:30:00.000Z"))
+    assert matches(row, where("Due", "after", "2024-05-01T15:00:00Z"))
+    assert not matches(row, where("Due", "after", "2024-05-01T16:00:00Z"))
+    # A naive filter value is compared as if in the page's zone
+    assert matches(row, where("Due", "before", "2024-05-01T16:00:00"))
+
+
+def test_missing_or_invalid_dates_never_match():
+    assert not matches(page(Due=date(None)), where("Due", "before", "2024-05-01"))
+    assert not matches(page(Due=date("2024-05-01")), where("Due", "after", "not a date"))
+
+
+def test_filters_are_combined_with_and():
+    row = page(Name=title("Report"), Points=number(3))
+    assert matches(row, where("Name", "contains", "rep"), where("Points", "equals", "3"))
+    assert not matches(row, where("Name", "contains", "rep"), where("Points", "equals", "4"))
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(UnsupportedFilterError):
+        compile_row_filters([where("Name", "matches_regex", ".*")])
+
+
+def test_formula_expressions():
+    row = page(Name=title("Report"), Points=number(3), Due=date("2024-05-01"), Tags=multi_select("a", "b"))
+    assert matches(row, formula('prop("Points") >= 3 and lower(prop("Name")) == "report"'))
+    assert matches(row, formula('"a" in prop("Tags") and length(prop("Tags")) == 2'))
+    assert matches(row, formula('date(prop("Due")) < date("2024-06-01")'))
+    assert matches(row, formula('not empty(prop("Name")) or prop("Points") < 0'))
+    assert matches(row, formula('1 < prop("Points") < 5'))
+    assert not matches(row, formula('prop("Points") > 3'))
+
+
+def test_formula_type_errors_do_not_match():
+    row = page(Name=title("Report"), Points=number(3))
+    assert not matches(row, formula('prop("Name") > 3'))
+    assert not matches(row, formula('-prop("Name")'))
+
+
+@pytest.mark.parametrize("expression", [
+    'prop("Points") >=',
+    '__import__("os").system("true")',
+    'prop("Name").upper() == "X"',
+    'prop("Points") + 1 > 2',
+    'prop("Points") is None',
+    '',
+])
+def test_invalid_formulas_are_rejected(expression):
+    with pytest.raises(UnsupportedFilterError):
+        compile_row_filters([formula(expression)])
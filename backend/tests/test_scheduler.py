@@ -0,0 +1,79 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from app.config import settings
+from app.models import DatabaseConfig, SchedulerCredit, User, UserPermission
+from app.services.scheduler import FairScheduler, claim_due_configs
+
+
+def add_config(db, owner, mirrors, overdue_minutes):
+    config = DatabaseConfig(
+        owner_user_id=owner.id,
+        source_database_id=f"source-{owner.id}",
+        config_name="Test",
+        sync_enabled=True,
+        next_sync_at=datetime.utcnow() - timedelta(minutes=overdue_minutes),
+    )
+    db.add(config)
+    db.flush()
+    for i in range(mirrors):
+        db.add(UserPermission(config_id=config.id, user_email=f"user{i}@example.com", access_level="read"))
+    return config
+
+
+def test_unspent_credit_carries_over():
+    scheduler = FairScheduler(quantum=4, max_pending_per_tenant=10)
+    candidates = [("big", 10, "big-config"), ("small", 1, "small-1"), ("small", 1, "small-2")]
+
+    # 10 mirrors can't be afforded with a quantum of 4, big saves up instead
+    assert scheduler.pick(candidates, Counter(), limit=2) == ["small-1", "small-2"]
+    assert scheduler.deficits == {"big": 4}
+
+    # 4 + 4 is still short and the slot goes to small again, on the next
+    # tick 4 + 4 + 4 is enough to go first
+    assert scheduler.pick([candidates[0], ("small", 1, "small-3")], Counter(), limit=1) == ["small-3"]
+    assert scheduler.deficits == {"big": 8}
+    assert scheduler.pick([candidates[0], ("small", 1, "small-4")], Counter(), limit=1) == ["big-config"]
+    assert scheduler.deficits == {}
+
+
+def test_credit_is_dropped_without_backlog():
+    scheduler = FairScheduler(quantum=4, max_pending_per_tenant=10, deficits={"a": 3, "gone": 7})
+    assert scheduler.pick([("a", 1, "a-1")], Counter(), limit=5) == ["a-1"]
+    assert scheduler.deficits == {}
+
+
+def test_tenants_share_slots_in_rounds():
+    scheduler = FairScheduler(quantum=1, max_pending_per_tenant=10)
+    candidates = [("a", 1, f"a-{i}") for i in range(5)] + [("b", 1, f"b-{i}") for i in range(5)]
+    assert scheduler.pick(candidates, Counter(), limit=4) == ["a-0", "b-0", "a-1", "b-1"]
+
+
+def test_pending_cap_per_tenant():
+    scheduler = FairScheduler(quantum=10, max_pending_per_tenant=2)
+    candidates = [("a", 1, f"a-{i}") for i in range(5)] + [("b", 1, "b-0")]
+    assert scheduler.pick(candidates, Counter(a=1), limit=5) == ["a-0", "b-0"]
+
+
+def test_credit_carries_over_between_ticks(db, monkeypatch):
+    monkeypatch.setattr(settings, "sync_fair_quantum", 4)
+    big_owner = User(email="big@example.com", password_hash="x")
+    small_owner = User(email="small@example.com", password_hash="x")
+    db.add_all([big_owner, small_owner])
+    db.flush()
+    big = add_config(db, big_owner, mirrors=6, overdue_minutes=10)
+    for _ in range(3):
+        add_config(db, small_owner, mirrors=1, overdue_minutes=5)
+    db.commit()
+
+    # The 6-mirror config can't be afforded with a quantum of 4, the slot
+    # goes to the other tenant
+    picked = claim_due_configs(db, limit=1, pending=Counter())
+    db.commit()
+    assert picked[0].owner_user_id == small_owner.id
+    assert db.get(SchedulerCredit, f"owner:{big_owner.id}").deficit == 4
+
+    # The credit is kept in the database, so the next tick affords it in
+    # whatever worker process runs it
+    assert claim_due_configs(db, limit=1, pending=Counter()) == [big]
+    db.commit()
+    assert db.get(SchedulerCredit, f"owner:{big_owner.id}") is None
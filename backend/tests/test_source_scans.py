@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import httpx
+from app.config import settings
+from app.models import RowFilter, UserPermission
+from tests.conftest import run_sync
+
+
+def count_source_queries(fake_notion, monkeypatch, source_id):
+    queries = []
+    handle = fake_notion._handle
+
+    async def counting_handle(request):
+        if request.url.path == f"/v1/databases/{source_id}/query":
+            queries.append(request)
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(counting_handle))
+    return queries
+
+
+def test_users_beyond_the_concurrency_limit_share_one_scan(db, fake_notion, make_config, monkeypatch):
+    monkeypatch.setattr(settings, "sync_max_concurrent_users", 4)
+    # 250 rows are 3 pages of results
+    config = make_config(rows=250, users=12)
+    filter_sets = [
+        RowFilter(config_id=config.id, filter_type="property_match",
+                  property_name="Points", operator="greater_than_or_equal_to", value="0"),
+        RowFilter(config_id=config.id, filter_type="formula", formula='prop("Points") < 1000'),
+    ]
+    for i, user_perm in enumerate(db.query(UserPermission).order_by(UserPermission.id)):
+        user_perm.row_filters = [filter_sets[i % 2]]
+    db.commit()
+
+    queries = count_source_queries(fake_notion, monkeypatch, config.source_database_id)
+    sync_log = run_sync(db, config.id)
+
+    # Both filter sets are evaluated locally on the same unfiltered scan
+    assert sync_log.status == "success"
+    assert sync_log.rows_created == 12 * 250
+    assert len(queries) == 3
+
+
+def test_each_distinct_query_is_scanned_once(db, fake_notion, make_config, monkeypatch):
+    monkeypatch.setattr(settings, "sync_max_concurrent_users", 4)
+    config = make_config(rows=250, users=12)
+    assert run_sync(db, config.id).status == "success"
+
+    # Half the users are due for a full scan, the others fetch recent edits
+    for user_perm in db.query(UserPermission).order_by(UserPermission.id).all()[::2]:
+        user_perm.last_full_sync_at = datetime.utcnow() - timedelta(days=1)
+    db.commit()
+
+    queries = count_source_queries(fake_notion, monkeypatch, config.source_database_id)
+    assert run_sync(db, config.id).status == "success"
+    assert len(queries) == 2 * 3
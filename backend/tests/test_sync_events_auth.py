@@ -0,0 +1,46 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.dependencies import get_current_user, get_sync_events_user
+from app.utils.security import create_access_token, create_sync_events_token
+import app.models as models
+
+
+@pytest.fixture
+def user(db):
+    user = models.User(email="owner@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_stream_token_opens_only_its_config(db, user):
+    token = create_sync_events_token(user.id, config_id=1)
+    assert get_sync_events_user(config_id=1, token=token, credentials=None, db=db) is user
+
+    with pytest.raises(HTTPException) as error:
+        get_sync_events_user(config_id=2, token=token, credentials=None, db=db)
+    assert error.value.status_code == 401
+
+
+def test_login_token_is_not_accepted_in_the_url(db, user):
+    login_token = create_access_token(data={"sub": str(user.id)})
+    with pytest.raises(HTTPException) as error:
+        get_sync_events_user(config_id=1, token=login_token, credentials=None, db=db)
+    assert error.value.status_code == 401
+
+    # The header still works for clients that can set it
+    assert get_sync_events_user(config_id=1, token=None, credentials=bearer(login_token), db=db) is user
+
+
+def test_stream_token_is_not_an_api_credential(db, user):
+    token = create_sync_events_token(user.id, config_id=1)
+    with pytest.raises(HTTPException) as error:
+        get_current_user(credentials=bearer(token), db=db)
+    assert error.value.status_code == 401
+    with pytest.raises(HTTPException):
+        get_sync_events_user(config_id=1, token=None, credentials=bearer(token), db=db)
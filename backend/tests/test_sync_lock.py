@@ -0,0 +1,50 @@
+import asyncio
+import httpx
+import pytest
+from app.config import settings
+from app.models import DatabaseConfig, PageMapping, SyncLog
+from app.services.sync_events import SyncProgress
+from app.services.sync_lock import SyncLease, SyncLeaseLost
+from tests.conftest import run_sync
+
+
+def slow_down(fake_notion, monkeypatch, delay):
+    handle = fake_notion._handle
+
+    async def slow_handle(request):
+        await asyncio.sleep(delay)
+        return await handle(request)
+
+    monkeypatch.setattr(fake_notion.transport, "_transport", httpx.MockTransport(slow_handle))
+
+
+def test_losing_the_lease_stops_the_sync(db, fake_notion, make_config, monkeypatch):
+    # Renewed every second, and taken over by another worker at the first renewal
+    monkeypatch.setattr(settings, "sync_lease_seconds", 3)
+    monkeypatch.setattr(SyncLease, "renew", lambda self: False)
+    slow_down(fake_notion, monkeypatch, 0.05)
+    config = make_config(rows=200, users=1)
+
+    with pytest.raises(SyncLeaseLost):
+        run_sync(db, config.id)
+
+    sync_log = db.query(SyncLog).filter_by(config_id=config.id).one()
+    assert sync_log.status == "error"
+    assert "lease" in sync_log.error_message
+    assert db.query(PageMapping).count() < 200
+
+
+def test_lease_is_released_when_cleanup_fails(db, fake_notion, make_config, monkeypatch):
+    async def fail(self, sync_log):
+        raise RuntimeError("progress broker is down")
+
+    monkeypatch.setattr(SyncProgress, "finish", fail)
+    config = make_config(rows=3, users=1)
+
+    with pytest.raises(RuntimeError):
+        run_sync(db, config.id)
+
+    db.expire_all()
+    config = db.get(DatabaseConfig, config.id)
+    assert config.sync_lease_owner is None
+    assert config.sync_lease_expires_at is None
@@ -0,0 +1,24 @@
+from app.models import PageMapping, UserPermission
+from tests.conftest import run_sync, title
+
+
+def test_edit_in_the_fetch_minute_is_picked_up(db, fake_notion, make_config):
+    config = make_config(rows=0, users=1)
+    assert run_sync(db, config.id).status == "success"
+    user = db.query(UserPermission).one()
+    assert user.last_source_edited_at is not None
+
+    # A row added right after the full scan, in the minute it started,
+    # gets a last_edited_time earlier than the moment the fetch started
+    page_id = fake_notion.add_page(
+        {"type": "database_id", "database_id": config.source_database_id},
+        {"Name": title("Late row"), "Points": {"type": "number", "number": 1}},
+    )
+    fetch_minute = user.last_full_sync_at.replace(second=0, microsecond=0)
+    fake_notion.pages[page_id]["last_edited_time"] = fetch_minute.strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+    # The next run is incremental and must still see it
+    assert run_sync(db, config.id).status == "success"
+    db.refresh(user)
+    assert user.last_full_sync_at.replace(second=0, microsecond=0) == fetch_minute
+    assert db.query(PageMapping).filter_by(user_permission_id=user.id, source_page_id=page_id).count() == 1
@@ -0,0 +1,31 @@
+import asyncio
+import threading
+import time
+from app.tasks.worker_loop import WorkerLoop
+
+
+def test_blocking_calls_in_threads_do_not_stall_other_tasks():
+    worker_loop = WorkerLoop()
+
+    async def blocking_call():
+        # e.g. a lease heartbeat waiting on a slow database
+        return await asyncio.to_thread(lambda: (time.sleep(0.3), threading.current_thread().name)[1])
+
+    async def ticker():
+        ticks = 0
+        started = time.monotonic()
+        while time.monotonic() - started < 0.3:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        return ticks
+
+    async def run():
+        return await asyncio.gather(blocking_call(), ticker())
+
+    try:
+        thread_name, ticks = worker_loop.run(run())
+    finally:
+        worker_loop.stop()
+
+    assert thread_name.startswith("sync-io")
+    assert ticks > 10
@@ -128,6 +128,48 @@ class APIClient {
         return this.request(`/sync/${configId}/status`);
     }
 
+    // Live sync progress: 'status', 'progress' and 'finished' events.
+    // EventSource can't send headers, so each connection is opened with a
+    // short-lived token that only grants this config's stream.
+    streamSyncEvents(configId, onEvent) {
+        let source = null;
+        let closed = false;
+
+        const reconnect = () => {
+            if (!closed) setTimeout(open, 3000);
+        };
+
+        const open = async () => {
+            try {
+                const { token } = await this.request(`/sync/${configId}/events/token`, {
+                    method: 'POST',
+                });
+                if (closed) return;
+                source = new EventSource(
+                    `${API_BASE_URL}/sync/${configId}/events?token=${encodeURIComponent(token)}`
+                );
+                for (const type of ['status', 'progress', 'finished']) {
+                    source.addEventListener(type, (event) => onEvent(JSON.parse(event.data)));
+                }
+                // The browser would retry with the same, soon expired token
+                source.onerror = () => {
+                    source.close();
+                    reconnect();
+                };
+            } catch (error) {
+                reconnect();
+            }
+        };
+
+        open();
+        return {
+            close() {
+                closed = true;
+                if (source) source.close();
+            },
+        };
+    }
+
     async getSyncLogs(configId, limit = 50) {
         return this.request(`/sync/${configId}/logs?limit=${limit}`);
     }